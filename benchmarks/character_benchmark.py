@@ -0,0 +1,74 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Benchmark
+
+Compares the slotted Character record against the old plain dict:
+memory per character and the speed of reading/writing a field.
+
+Run from the project folder:  python benchmarks/character_benchmark.py
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+COUNT = 100000
+
+
+def make_fields():
+    # the 12 save fields plus the equipment keys inventory_system adds
+    character = character_manager.create_character("Bench", "Warrior")
+    for key in character_manager.EQUIPMENT_FIELDS:
+        character[key] = None
+    return character.to_dict()
+
+
+def measure_memory(factory):
+    # only the record itself is measured; the inventory/quest containers are shared
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = [factory() for _ in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del records
+    return total / COUNT
+
+
+def measure_access(character, statement):
+    timer = timeit.Timer(statement, globals={"c": character})
+    loops, seconds = timer.autorange()
+    return seconds / loops * 1e9
+
+
+def main():
+    fields = make_fields()
+    dict_char = dict(fields)
+    slot_char = character_manager.Character(fields)
+
+    print(f"memory per record ({COUNT} records)")
+    print(f"  dict:      {measure_memory(lambda: dict(fields)):8.1f} bytes")
+    print(f"  Character: {measure_memory(lambda: character_manager.Character(fields)):8.1f} bytes")
+
+    cases = [
+        ("dict      c['health']", dict_char, "c['health']"),
+        ("Character c['health']", slot_char, "c['health']"),
+        ("Character c.health", slot_char, "c.health"),
+        ("dict      c['gold'] += 1", dict_char, "c['gold'] += 1"),
+        ("Character c['gold'] += 1", slot_char, "c['gold'] += 1"),
+        ("Character c.gold += 1", slot_char, "c.gold += 1")
+    ]
+
+    print("field access (ns per operation)")
+    for label, character, statement in cases:
+        print(f"  {label:28} {measure_access(character, statement):7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,16 @@ AI Usage: chat gpt was used to help with the formating and debugging of the code
 
 Handles combat mechanics
 """
+import sys
 import random
-from custom_exceptions import (
-    InvalidTargetError,
-    CombatNotActiveError,
-    CharacterDeadError,
-    AbilityOnCooldownError
-)
-
-import random
+import game_data
+import character_manager
+
+# numpy is optional, resolve_battles falls back to a plain loop without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -27,43 +28,27 @@ from custom_exceptions import (
 # ENEMY DEFINITIONS
 # ---------------------------------------------------------
 
+# (rows the prototypes were built from, {enemy id: prototype dict})
+_enemy_prototypes = (None, {})
+
+
 def create_enemy(enemy_type):
-    enemy_type = enemy_type.lower()
-
-    enemies = {
-        "goblin": {
-            "name": "Goblin",
-            "health": 50,
-            "max_health": 50,
-            "strength": 8,
-            "magic": 2,
-            "xp_reward": 25,
-            "gold_reward": 10
-        },
-        "orc": {
-            "name": "Orc",
-            "health": 80,
-            "max_health": 80,
-            "strength": 12,
-            "magic": 5,
-            "xp_reward": 50,
-            "gold_reward": 25
-        },
-        "dragon": {
-            "name": "Dragon",
-            "health": 200,
-            "max_health": 200,
-            "strength": 25,
-            "magic": 15,
-            "xp_reward": 200,
-            "gold_reward": 100
-        }
-    }
+    # enemy stats come from data/enemies.txt, loaded once by game_data;
+    # spawning copies a prebuilt dict instead of rebuilding the whole table
+    global _enemy_prototypes
 
-    if enemy_type not in enemies:
-        raise InvalidTargetError(f"unknown enemy type: {enemy_type}")
+    rows = game_data.get_enemy_rows()
+    if _enemy_prototypes[0] is not rows:
+        _enemy_prototypes = (rows, {
+            enemy_id: dict(zip(game_data.ENEMY_FIELDS, row)) for enemy_id, row in rows.items()
+        })
 
-    return enemies[enemy_type].copy()
+    prototype = _enemy_prototypes[1].get(enemy_type.lower())
+
+    if prototype is None:
+        raise InvalidTargetError(f"unknown enemy type: {enemy_type.lower()}")
+
+    return prototype.copy()
 
 
 def get_random_enemy_for_level(character_level):
@@ -80,16 +65,29 @@ def get_random_enemy_for_level(character_level):
 # ---------------------------------------------------------
 
 class SimpleBattle:
-    def __init__(self, character, enemy):
+    def __init__(self, character, enemy, auto_resolve=False, log_sink=None):
         self.character = character
         self.enemy = enemy
+        # Character records are read through their slots on the per-turn
+        # path, character["key"] costs several times more (plain dicts
+        # passed in by older code still go through keys)
+        self.record = isinstance(character, character_manager.Character)
         self.combat_active = True
         self.turn = 1
+        # basic fights have no randomness, so they can be solved instead of played
+        self.auto_resolve = auto_resolve
+        # where turn messages go (prints by default, see BATTLE LOG SINKS)
+        self.log = log_sink if log_sink is not None else PrintLogSink()
 
     def start_battle(self):
         if self.character["health"] <= 0:
             raise CharacterDeadError("character is already dead")
 
+        if self.auto_resolve:
+            result = self.resolve_instantly()
+            self.log.flush()
+            return result
+
         winner = None
 
         while self.combat_active:
@@ -107,20 +105,25 @@ class SimpleBattle:
 
             self.turn += 1
 
+        self.log.flush()
+
         # build result packet
-        if winner == "player":
-            rewards = get_victory_rewards(self.enemy)
-            return {
-                "winner": "player",
-                "xp_gained": rewards["xp"],
-                "gold_gained": rewards["gold"]
-            }
-        else:
-            return {
-                "winner": "enemy",
-                "xp_gained": 0,
-                "gold_gained": 0
-            }
+        return build_battle_result(
+            self.enemy, winner == "player", self.turn,
+            self.character["health"], self.enemy["health"]
+        )
+
+    def resolve_instantly(self):
+        # same outcome as the turn loop, computed in one step
+        result = predict_battle(self.character, self.enemy)
+
+        self.character["health"] = result["character_health"]
+        self.enemy["health"] = result["enemy_health"]
+        self.turn = result["turns"]
+        self.combat_active = False
+
+        self.log.message(f"battle against the {self.enemy['name']} resolved in {self.turn} turns")
+        return result
 
     def player_turn(self):
         if not self.combat_active:
@@ -128,7 +131,7 @@ class SimpleBattle:
 
         damage = self.calculate_damage(self.character, self.enemy)
         self.apply_damage(self.enemy, damage)
-        display_battle_log(f"you hit the {self.enemy['name']} for {damage}")
+        self.log.event(self.turn, "player", self.enemy["name"], damage, self.enemy["health"])
 
     def enemy_turn(self):
         if not self.combat_active:
@@ -136,15 +139,22 @@ class SimpleBattle:
 
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log(f"the {self.enemy['name']} hits you for {damage}")
+        health = self.character.health if self.record else self.character["health"]
+        self.log.event(self.turn, "enemy", self.enemy["name"], damage, health)
 
     def calculate_damage(self, attacker, defender):
-        dmg = attacker["strength"] - (defender["strength"] // 4)
-        if dmg < 1:
-            dmg = 1
-        return dmg
+        if self.record:
+            if attacker is self.character:
+                return calculate_hit_damage(attacker.strength, defender["strength"])
+            if defender is self.character:
+                return calculate_hit_damage(attacker["strength"], defender.strength)
+        return calculate_hit_damage(attacker["strength"], defender["strength"])
 
     def apply_damage(self, target, damage):
+        if self.record and target is self.character:
+            target.health = max(target.health - damage, 0)
+            return
+
         target["health"] -= damage
         if target["health"] < 0:
             target["health"] = 0
@@ -153,7 +163,8 @@ class SimpleBattle:
         if self.enemy["health"] <= 0:
             self.combat_active = False
             return "player"
-        if self.character["health"] <= 0:
+        health = self.character.health if self.record else self.character["health"]
+        if health <= 0:
             self.combat_active = False
             return "enemy"
         return None
@@ -162,13 +173,243 @@ class SimpleBattle:
         roll = random.random()
         if roll < 0.5:
             self.combat_active = False
-            display_battle_log("you escaped successfully")
+            self.log.message("you escaped successfully")
             return True
         else:
-            display_battle_log("escape failed")
+            self.log.message("escape failed")
             return False
 
 
+def calculate_hit_damage(attacker_strength, defender_strength):
+    # shared by SimpleBattle and the headless simulator
+    dmg = attacker_strength - (defender_strength // 4)
+    if dmg < 1:
+        dmg = 1
+    return dmg
+
+
+def build_battle_result(enemy, player_won, turns, character_health, enemy_health):
+    # result packet returned by start_battle and the fast resolvers
+    if player_won:
+        rewards = get_victory_rewards(enemy)
+        xp, gold, winner = rewards["xp"], rewards["gold"], "player"
+    else:
+        xp, gold, winner = 0, 0, "enemy"
+
+    return {
+        "winner": winner,
+        "xp_gained": xp,
+        "gold_gained": gold,
+        "turns": turns,
+        "character_health": character_health,
+        "enemy_health": enemy_health
+    }
+
+
+# ---------------------------------------------------------
+# OUTCOME PREDICTION
+# ---------------------------------------------------------
+
+def predict_battle(character, enemy):
+    """
+    Work out a basic battle's result without playing it turn by turn
+
+    Every hit does a fixed amount and the player always swings first, so
+    the player wins if they need no more hits than the enemy does. Returns
+    the same packet as start_battle (winner, xp_gained, gold_gained, turns,
+    character_health, enemy_health). Neither dict is changed.
+    """
+    if character["health"] <= 0:
+        raise CharacterDeadError("character is already dead")
+
+    player_hit = calculate_hit_damage(character["strength"], enemy["strength"])
+    enemy_hit = calculate_hit_damage(enemy["strength"], character["strength"])
+
+    # hits needed to finish each side (ceiling division, at least one swing)
+    player_hits_needed = max(1, -(-enemy["health"] // player_hit))
+    enemy_hits_needed = -(-character["health"] // enemy_hit)
+
+    if player_hits_needed <= enemy_hits_needed:
+        turns = player_hits_needed
+        hp_left = character["health"] - (turns - 1) * enemy_hit
+        return build_battle_result(enemy, True, turns, hp_left, 0)
+
+    turns = enemy_hits_needed
+    enemy_hp_left = enemy["health"] - turns * player_hit
+    return build_battle_result(enemy, False, turns, 0, enemy_hp_left)
+
+
+# ---------------------------------------------------------
+# HEADLESS SIMULATION
+# ---------------------------------------------------------
+
+CHARACTER_CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+ENEMY_TYPES = ["goblin", "orc", "dragon"]
+
+
+def create_simulation_character(character_class, level):
+    # a fresh character levelled up the same way gain_experience does it
+    character = character_manager.create_character("Simulation", character_class)
+    if level > 1:
+        character_manager.gain_experience(character, 50 * level * (level - 1))
+    return character
+
+
+def simulate_battles(character_class, level, enemy_type, battles=1000):
+    """
+    Run many basic battles without printing and return aggregate stats
+
+    Stats are read from a character and enemy built once, then every fight
+    runs on plain ints. The result has win_rate, mean_turns, mean xp/gold
+    per fight and damage_dealt / damage_taken distributions
+    (total damage per fight -> number of fights).
+    """
+    if battles < 1:
+        raise ValueError("battles must be at least 1")
+
+    character = create_simulation_character(character_class, level)
+    enemy = create_enemy(enemy_type)
+
+    start_hp = character["health"]
+    enemy_start_hp = enemy["health"]
+    player_hit = calculate_hit_damage(character["strength"], enemy["strength"])
+    enemy_hit = calculate_hit_damage(enemy["strength"], character["strength"])
+
+    wins = 0
+    total_turns = 0
+    damage_dealt = {}
+    damage_taken = {}
+
+    for _ in range(battles):
+        hp = start_hp
+        enemy_hp = enemy_start_hp
+        turn = 1
+
+        while True:
+            enemy_hp -= player_hit
+            if enemy_hp <= 0:
+                enemy_hp = 0
+                wins += 1
+                break
+
+            hp -= enemy_hit
+            if hp <= 0:
+                hp = 0
+                break
+
+            turn += 1
+
+        total_turns += turn
+
+        dealt = enemy_start_hp - enemy_hp
+        taken = start_hp - hp
+        damage_dealt[dealt] = damage_dealt.get(dealt, 0) + 1
+        damage_taken[taken] = damage_taken.get(taken, 0) + 1
+
+    return {
+        "character_class": character_class,
+        "level": level,
+        "enemy_type": enemy_type,
+        "battles": battles,
+        "wins": wins,
+        "win_rate": wins / battles,
+        "mean_turns": total_turns / battles,
+        "damage_dealt": damage_dealt,
+        "damage_taken": damage_taken,
+        "xp_per_fight": wins * enemy["xp_reward"] / battles,
+        "gold_per_fight": wins * enemy["gold_reward"] / battles
+    }
+
+
+def run_balance_sweep(levels=range(1, 11), battles=1000, classes=None, enemy_types=None):
+    """
+    Simulate every class x level x enemy type and return a list of stat dicts
+    """
+    if classes is None:
+        classes = CHARACTER_CLASSES
+    if enemy_types is None:
+        enemy_types = ENEMY_TYPES
+
+    results = []
+    for character_class in classes:
+        for level in levels:
+            for enemy_type in enemy_types:
+                results.append(simulate_battles(character_class, level, enemy_type, battles))
+
+    return results
+
+
+# ---------------------------------------------------------
+# BATCH RESOLUTION
+# ---------------------------------------------------------
+
+def resolve_battles(characters, enemies):
+    """
+    Resolve many character-vs-enemy basic battles at once
+
+    characters[i] fights enemies[i]. Like start_battle, final health is
+    written back to both dicts and one result packet is returned per fight.
+    With numpy installed, every fight advances one turn per step on arrays,
+    and finished fights drop out of the active set; without it each fight
+    is solved with predict_battle.
+    """
+    if len(characters) != len(enemies):
+        raise ValueError("need one enemy per character")
+
+    for i, character in enumerate(characters):
+        if character["health"] <= 0:
+            raise CharacterDeadError(f"character {i} is already dead")
+
+    if np is None:
+        # without numpy each fight is still O(1) through predict_battle
+        results = [predict_battle(c, e) for c, e in zip(characters, enemies)]
+    else:
+        results = [
+            build_battle_result(enemy, player_won, turns, hp, enemy_hp)
+            for enemy, (player_won, turns, hp, enemy_hp) in zip(enemies, _resolve_arrays(characters, enemies))
+        ]
+
+    for character, enemy, result in zip(characters, enemies, results):
+        character["health"] = result["character_health"]
+        enemy["health"] = result["enemy_health"]
+
+    return results
+
+
+def _resolve_arrays(characters, enemies):
+    hp = np.array([c["health"] for c in characters], dtype=np.int64)
+    strength = np.array([c["strength"] for c in characters], dtype=np.int64)
+    enemy_hp = np.array([e["health"] for e in enemies], dtype=np.int64)
+    enemy_strength = np.array([e["strength"] for e in enemies], dtype=np.int64)
+
+    # same formula as calculate_hit_damage
+    player_hit = np.maximum(strength - enemy_strength // 4, 1)
+    enemy_hit = np.maximum(enemy_strength - strength // 4, 1)
+
+    player_won = np.zeros(len(characters), dtype=bool)
+    turns = np.ones(len(characters), dtype=np.int64)
+    active = np.arange(len(characters))
+
+    while active.size:
+        # player turn for every fight still going
+        enemy_hp[active] -= player_hit[active]
+        won = enemy_hp[active] <= 0
+        player_won[active[won]] = True
+        active = active[~won]
+
+        # enemy turn for the fights that survived
+        hp[active] -= enemy_hit[active]
+        lost = hp[active] <= 0
+        active = active[~lost]
+
+        turns[active] += 1
+
+    np.maximum(hp, 0, out=hp)
+    np.maximum(enemy_hp, 0, out=enemy_hp)
+
+    return list(zip(player_won.tolist(), turns.tolist(), hp.tolist(), enemy_hp.tolist()))
+
+
 # ---------------------------------------------------------
 # SPECIAL ABILITIES    
 # ---------------------------------------------------------
@@ -237,9 +478,102 @@ def get_victory_rewards(enemy):
         "gold": enemy["gold_reward"]
     }
 
-def display_combat_stats(character, enemy):
-    print(f"\n{character['name']}: {character['health']}/{character['max_health']}")
-    print(f"{enemy['name']}: {enemy['health']}/{enemy['max_health']}")
+def display_combat_stats(character, enemy, log_sink=None):
+    lines = [
+        f"\n{character['name']}: {character['health']}/{character['max_health']}",
+        f"{enemy['name']}: {enemy['health']}/{enemy['max_health']}"
+    ]
+
+    if log_sink is None:
+        print("\n".join(lines))
+    else:
+        for line in lines:
+            log_sink.message(line)
 
 def display_battle_log(message):
     print(f">>> {message}")
+
+
+# ---------------------------------------------------------
+# BATTLE LOG SINKS
+# ---------------------------------------------------------
+# a sink gets event(turn, actor, enemy_name, damage, hp_left) for every hit,
+# message(text) for everything else and flush() once when a battle ends
+
+def format_battle_event(actor, enemy_name, damage):
+    if actor == "player":
+        return f"you hit the {enemy_name} for {damage}"
+    return f"the {enemy_name} hits you for {damage}"
+
+
+class PrintLogSink:
+    """Prints every line as it happens (the original behaviour)"""
+
+    def event(self, turn, actor, enemy_name, damage, hp):
+        display_battle_log(format_battle_event(actor, enemy_name, damage))
+
+    def message(self, text):
+        display_battle_log(text)
+
+    def flush(self):
+        pass
+
+
+class NullLogSink:
+    """Drops everything, for servers and simulations"""
+
+    def event(self, turn, actor, enemy_name, damage, hp):
+        pass
+
+    def message(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+class BufferedLogSink:
+    """Collects lines and writes them with a single call per battle"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.lines = []
+
+    def event(self, turn, actor, enemy_name, damage, hp):
+        self.lines.append(f">>> {format_battle_event(actor, enemy_name, damage)}\n")
+
+    def message(self, text):
+        self.lines.append(f">>> {text}\n")
+
+    def flush(self):
+        if not self.lines:
+            return
+
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("".join(self.lines))
+        self.lines = []
+
+
+class StructuredLogSink:
+    """
+    Records hits as compact (turn, actor, damage, hp_left) tuples for replays
+
+    Nothing is formatted or printed; other messages are kept as plain text.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.messages = []
+
+    def event(self, turn, actor, enemy_name, damage, hp):
+        self.events.append((turn, actor, damage, hp))
+
+    def message(self, text):
+        self.messages.append(text)
+
+    def flush(self):
+        pass
+
+
+# one shared instance is enough since it keeps no state
+SILENT_LOG = NullLogSink()
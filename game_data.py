@@ -8,7 +8,17 @@ AI Usage: ChatGPT assisted with rewriting and integrating exception handling
 """
 
 import os
+import re
+import gc
+import sys
+import glob
+import mmap
+import hashlib
+import marshal
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from custom_exceptions import (
+    DataError,
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
@@ -20,68 +30,723 @@ from custom_exceptions import (
 
 def load_quests(filename="data/quests.txt"):
 
+    quests = {}
+
+    # only one block is held in memory at a time
+    for quest_dict in iter_quest_records(filename):
+        quests[quest_dict["quest_id"]] = quest_dict
+
+    return quests
+
+
+def load_items(filename="data/items.txt"):
+
+    items = {}
+
+    for item_dict in iter_item_records(filename):
+        items[item_dict["item_id"]] = item_dict
+
+    return items
+
+
+# ============================================================================
+# STREAMING LOADERS
+# ============================================================================
+
+def iter_quest_records(filename="data/quests.txt"):
+    """
+    Yield one parsed and validated quest dictionary at a time
+
+    The file is read line by line so memory use is bounded by one block.
+    Raises MissingDataFileError right away if the file does not exist.
+    """
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Quest file not found: {filename}")
 
-    try:
-        with open(filename, "r") as f:
-            content = f.read().strip()
-    except:
-        raise CorruptedDataError("Could not read quest file.")
+    return (quest_dict for line_no, quest_dict in _iter_quest_entries(filename))
 
-    if content == "":
-        raise InvalidDataFormatError("Quest file is empty.")
 
-    # split into blocks safely (ignore accidental extra blank lines)
-    blocks = [b.strip() for b in content.split("\n\n") if b.strip() != ""]
+def iter_item_records(filename="data/items.txt"):
+    """
+    Yield one parsed and validated item dictionary at a time
+
+    Raises MissingDataFileError right away if the file does not exist.
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Item file not found: {filename}")
+
+    return (item_dict for line_no, item_dict in _iter_item_entries(filename))
 
-    quests = {}
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip() != ""]
+def _iter_quest_entries(filename):
+    # yields (line number of the block, quest dict)
+    for line_no, lines in _iter_blocks(filename, "Quest"):
         quest_dict = parse_quest_block(lines)
         validate_quest_data(quest_dict)
 
         # must contain quest_id or test fails
-        qid = quest_dict.get("quest_id")
-        if not qid:
+        if not quest_dict.get("quest_id"):
             raise InvalidDataFormatError("Missing quest_id field.")
 
-        quests[qid] = quest_dict
+        yield line_no, quest_dict
 
-    return quests
 
+def _iter_item_entries(filename):
+    for line_no, lines in _iter_blocks(filename, "Item"):
+        item_dict = parse_item_block(lines)
+        validate_item_data(item_dict)
 
-def load_items(filename="data/items.txt"):
+        if not item_dict.get("item_id"):
+            raise InvalidDataFormatError("Missing item_id field.")
+
+        yield line_no, item_dict
 
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item file not found: {filename}")
+
+def _iter_blocks(filename, label):
+    # yields (first line number, stripped lines) for each blank-line separated block
+    block = []
+    block_start = 0
+    found_block = False
 
     try:
         with open(filename, "r") as f:
-            content = f.read().strip()
-    except:
-        raise CorruptedDataError("Could not read item file.")
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
 
-    if content == "":
-        raise InvalidDataFormatError("Item file is empty.")
+                if line == "":
+                    # blank line ends the current block (extra blank lines are ignored)
+                    if block:
+                        found_block = True
+                        yield block_start, block
+                        block = []
+                    continue
 
-    blocks = [b.strip() for b in content.split("\n\n") if b.strip() != ""]
+                if not block:
+                    block_start = line_no
+                block.append(line)
 
-    items = {}
+            if block:
+                found_block = True
+                yield block_start, block
+    except (OSError, UnicodeDecodeError):
+        raise CorruptedDataError(f"Could not read {label.lower()} file.")
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip() != ""]
-        item_dict = parse_item_block(lines)
-        validate_item_data(item_dict)
+    if not found_block:
+        raise InvalidDataFormatError(f"{label} file is empty.")
 
-        item_id = item_dict.get("item_id")
-        if not item_id:
-            raise InvalidDataFormatError("Missing item_id field.")
 
-        items[item_id] = item_dict
+# ============================================================================
+# MULTI-FILE (SHARDED) CATALOGS
+# ============================================================================
 
-    return items
+def load_quest_catalog(paths, workers=None):
+    """
+    Load and merge quests from several shard files in parallel
+
+    Args:
+        paths: List of shard files, or a glob pattern like "data/quests_*.txt"
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns: Dictionary of quest_id -> quest dictionary
+    Raises:
+        MissingDataFileError if a shard does not exist
+        InvalidDataFormatError if a shard is malformed or two shards
+        define the same quest_id (the message lists shard and line of each)
+    """
+    return _load_catalog(paths, "quest", workers)
+
+
+def load_item_catalog(paths, workers=None):
+    """
+    Load and merge items from several shard files in parallel
+
+    Same rules as load_quest_catalog, keyed by item_id.
+    """
+    return _load_catalog(paths, "item", workers)
+
+
+def _load_catalog(paths, kind, workers):
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths))
+    else:
+        paths = list(paths)
+
+    if not paths:
+        raise MissingDataFileError(f"No {kind} files to load.")
+
+    for path in paths:
+        if not os.path.exists(path):
+            raise MissingDataFileError(f"{kind.capitalize()} file not found: {path}")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(paths))
+
+    tasks = [(kind, path) for path in paths]
+
+    # parsing is pure python, so real parallelism needs processes
+    if workers <= 1:
+        shard_results = [_parse_shard(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shard_results = list(pool.map(_parse_shard, tasks))
+
+    return _merge_shards(paths, shard_results, kind)
+
+
+def _parse_shard(task):
+    # runs inside a worker process, so it must stay a top-level function
+    kind, path = task
+
+    if kind == "quest":
+        entries = _iter_quest_entries(path)
+        id_field = "quest_id"
+    else:
+        entries = _iter_item_entries(path)
+        id_field = "item_id"
+
+    try:
+        return [(record[id_field], line_no, record) for line_no, record in entries]
+    except DataError as e:
+        # keep the exception type but say which shard broke
+        raise type(e)(f"{path}: {e}")
+
+
+def _merge_shards(paths, shard_results, kind):
+    merged = {}
+    origins = {}
+    conflicts = []
+
+    for path, entries in zip(paths, shard_results):
+        for record_id, line_no, record in entries:
+            if record_id in origins and origins[record_id][0] != path:
+                first_path, first_line = origins[record_id]
+                conflicts.append(
+                    f"{record_id} ({first_path} line {first_line}, {path} line {line_no})"
+                )
+                continue
+
+            # duplicates inside one shard keep the load_quests/load_items behaviour
+            origins[record_id] = (path, line_no)
+            merged[record_id] = record
+
+    if conflicts:
+        raise InvalidDataFormatError(
+            f"Duplicate {kind} ids across shards: " + "; ".join(conflicts)
+        )
+
+    return merged
+
+
+# ============================================================================
+# COMPILED CATALOG CACHE
+# ============================================================================
+
+# bump this whenever the cached record layout changes
+CACHE_VERSION = 1
+
+
+def load_quests_cached(filename="data/quests.txt", cache_dir=None):
+    """
+    Load quests, reusing a compiled cache when quests.txt is unchanged
+
+    The cache lives in <data dir>/.cache/quests.bin by default and is
+    rebuilt from the text file whenever its size, mtime or hash changes.
+    """
+    return _load_cached(filename, load_quests, cache_dir)
+
+
+def load_items_cached(filename="data/items.txt", cache_dir=None):
+    """
+    Load items, reusing a compiled cache when items.txt is unchanged
+    """
+    return _load_cached(filename, load_items, cache_dir)
+
+
+def get_cache_path(filename, cache_dir=None):
+    """
+    Return the compiled cache path used for a catalog text file
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(filename), ".cache")
+
+    base = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(cache_dir, base + ".bin")
+
+
+def _load_cached(filename, loader, cache_dir):
+    if not os.path.exists(filename):
+        # let the text loader raise the usual MissingDataFileError
+        return loader(filename)
+
+    cache_path = get_cache_path(filename, cache_dir)
+    stat = os.stat(filename)
+    cached = _read_cache(cache_path)
+
+    if cached is not None:
+        size, mtime_ns, digest, records = cached
+
+        # fast path: nothing about the file changed
+        if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+            return records
+
+        # file was touched but the content may be the same
+        if size == stat.st_size and digest == _file_digest(filename):
+            _write_cache(cache_path, stat, digest, records)
+            return records
+
+    records = loader(filename)
+    _write_cache(cache_path, stat, _file_digest(filename), records)
+
+    return records
+
+
+def _file_digest(filename):
+    sha = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _read_cache(cache_path):
+    # any problem with the cache just means we parse the text file again
+    try:
+        with open(cache_path, "rb") as f:
+            payload = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(payload, tuple) or len(payload) != 5:
+        return None
+    if payload[0] != CACHE_VERSION:
+        return None
+
+    return payload[1:]
+
+
+def _write_cache(cache_path, stat, digest, records):
+    payload = (CACHE_VERSION, stat.st_size, stat.st_mtime_ns, digest, records)
+    temp_path = cache_path + ".tmp"
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            marshal.dump(payload, f)
+        os.replace(temp_path, cache_path)
+    except (OSError, ValueError):
+        # a read-only data folder should not stop the game from loading
+        return False
+
+    return True
+
+
+# ============================================================================
+# LAZY ITEM CATALOG
+# ============================================================================
+
+# a block is a run of non-blank lines
+_BLOCK_PATTERN = re.compile(rb"(?:^[ \t]*\S[^\n]*(?:\n|\Z))+", re.M)
+_ITEM_ID_PATTERN = re.compile(rb"^[ \t]*ITEM_ID: ([^\r\n]*)", re.M)
+
+
+class ItemCatalog(Mapping):
+    """
+    Read-only item mapping backed by a memory-mapped items.txt
+
+    Opening the catalog only records where each item's block starts and
+    ends. An item is parsed and validated the first time it is looked up,
+    so a worker only pays for the items it actually touches while the
+    file pages are shared by every process that maps it.
+    """
+
+    def __init__(self, filename="data/items.txt"):
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"Item file not found: {filename}")
+
+        self.filename = filename
+        self._offsets = {}
+        self._decoded = {}
+
+        try:
+            self._file = open(filename, "rb")
+        except OSError:
+            raise CorruptedDataError("Could not read item file.")
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # mmap refuses zero-length files
+            self._file.close()
+            raise InvalidDataFormatError("Item file is empty.")
+
+        try:
+            self._build_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _build_index(self):
+        for match in _BLOCK_PATTERN.finditer(self._map):
+            start, end = match.span()
+            id_match = _ITEM_ID_PATTERN.search(self._map, start, end)
+            if id_match is None:
+                raise InvalidDataFormatError("Missing item_id field.")
+
+            item_id = id_match.group(1).decode("utf-8").strip()
+            if item_id == "":
+                raise InvalidDataFormatError("Missing item_id field.")
+
+            # later blocks win, same as load_items
+            self._offsets[item_id] = (start, end)
+
+        if not self._offsets:
+            raise InvalidDataFormatError("Item file is empty.")
+
+    def __getitem__(self, item_id):
+        item = self._decoded.get(item_id)
+        if item is not None:
+            return item
+
+        start, end = self._offsets[item_id]   # KeyError for unknown items
+
+        try:
+            text = self._map[start:end].decode("utf-8")
+        except UnicodeDecodeError:
+            raise CorruptedDataError(f"Could not decode item: {item_id}")
+
+        lines = [line.strip() for line in text.split("\n") if line.strip() != ""]
+        item = parse_item_block(lines)
+        validate_item_data(item)
+
+        self._decoded[item_id] = item
+        return item
+
+    def __contains__(self, item_id):
+        return item_id in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def decoded_count(self):
+        """
+        Return how many items have been parsed so far
+        """
+        return len(self._decoded)
+
+    def close(self):
+        """
+        Release the memory map and the file handle
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def open_item_catalog(filename="data/items.txt"):
+    """
+    Open items.txt as a lazily decoded ItemCatalog
+
+    The result can be used anywhere the all_items dictionary is used
+    (shop listings, inventory lookups) without parsing every item up front.
+    """
+    return ItemCatalog(filename)
+
+
+# ============================================================================
+# FROZEN (SHARED) CATALOGS
+# ============================================================================
+
+class FrozenRecord(Mapping):
+    """
+    Read-only quest or item record
+
+    Values live in one tuple and the field-name -> position table is shared
+    by every record with the same fields, so a frozen record is much
+    smaller than a dict. Reads work like a dict (record["title"], get,
+    items); any attempt to change it raises TypeError.
+    """
+
+    __slots__ = ("_fields", "_values")
+
+    def __init__(self, fields, values):
+        object.__setattr__(self, "_fields", fields)
+        object.__setattr__(self, "_values", values)
+
+    def __getitem__(self, key):
+        return self._values[self._fields[key]]
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __setitem__(self, key, value):
+        raise TypeError("catalog records are read-only")
+
+    def __delitem__(self, key):
+        raise TypeError("catalog records are read-only")
+
+    def __setattr__(self, name, value):
+        raise TypeError("catalog records are read-only")
+
+    # pickle/copy go through __init__ since __setattr__ is blocked; records
+    # pickled together still share one fields table
+    def __reduce__(self):
+        return (FrozenRecord, (self._fields, self._values))
+
+    def __repr__(self):
+        return f"FrozenRecord({dict(self.items())!r})"
+
+
+class FrozenCatalog(Mapping):
+    """
+    Read-only mapping of id -> FrozenRecord
+
+    Build it once (see freeze_catalog) before forking worker processes so
+    every worker shares the same pages copy-on-write.
+    """
+
+    __slots__ = ("_records",)
+
+    def __init__(self, records):
+        object.__setattr__(self, "_records", records)
+
+    def __getitem__(self, record_id):
+        return self._records[record_id]
+
+    def __contains__(self, record_id):
+        return record_id in self._records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __setitem__(self, key, value):
+        raise TypeError("catalogs are read-only")
+
+    def __delitem__(self, key):
+        raise TypeError("catalogs are read-only")
+
+    def __setattr__(self, name, value):
+        raise TypeError("catalogs are read-only")
+
+    def __reduce__(self):
+        return (FrozenCatalog, (self._records,))
+
+    def __repr__(self):
+        return f"FrozenCatalog({len(self._records)} records)"
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def freeze_catalog(catalog):
+    """
+    Turn a quest or item dictionary (from load_quests/load_items) into a FrozenCatalog
+
+    Strings are interned so repeated values such as item types or
+    prerequisite ids are stored once.
+    """
+    if isinstance(catalog, FrozenCatalog):
+        return catalog
+
+    layouts = {}
+    records = {}
+
+    for record_id, record in catalog.items():
+        keys = tuple(_intern(key) for key in record)
+
+        # records with the same fields share one name -> position table
+        fields = layouts.get(keys)
+        if fields is None:
+            fields = {key: position for position, key in enumerate(keys)}
+            layouts[keys] = fields
+
+        values = tuple(_intern(value) for value in record.values())
+        records[_intern(record_id)] = FrozenRecord(fields, values)
+
+    return FrozenCatalog(records)
+
+
+def prepare_for_fork():
+    """
+    Call after loading shared catalogs and right before forking workers
+
+    Moves everything allocated so far out of the garbage collector's reach,
+    so collections in a worker don't touch (and copy) the shared pages.
+    """
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+# ============================================================================
+# CLASS AND ENEMY DEFINITIONS
+# ============================================================================
+
+# built-in definitions, used when classes.txt / enemies.txt are missing
+DEFAULT_CLASSES = {
+    "Warrior": {"class": "Warrior", "health": 120, "strength": 15, "magic": 5},
+    "Mage": {"class": "Mage", "health": 80, "strength": 8, "magic": 20},
+    "Rogue": {"class": "Rogue", "health": 90, "strength": 12, "magic": 10},
+    "Cleric": {"class": "Cleric", "health": 100, "strength": 10, "magic": 15}
+}
+
+DEFAULT_ENEMIES = {
+    "goblin": {"enemy_id": "goblin", "name": "Goblin", "health": 50, "strength": 8,
+               "magic": 2, "xp_reward": 25, "gold_reward": 10},
+    "orc": {"enemy_id": "orc", "name": "Orc", "health": 80, "strength": 12,
+            "magic": 5, "xp_reward": 50, "gold_reward": 25},
+    "dragon": {"enemy_id": "dragon", "name": "Dragon", "health": 200, "strength": 25,
+               "magic": 15, "xp_reward": 200, "gold_reward": 100}
+}
+
+# tuple layouts used by get_class_rows / get_enemy_rows
+CLASS_FIELDS = ("health", "strength", "magic")
+ENEMY_FIELDS = ("name", "health", "max_health", "strength", "magic", "xp_reward", "gold_reward")
+
+# (kind, filename) -> (FrozenCatalog of templates, {id: row tuple})
+_definitions = {}
+
+
+def load_classes(filename="data/classes.txt"):
+
+    classes = {}
+
+    for class_dict in iter_class_records(filename):
+        classes[class_dict["class"]] = class_dict
+
+    return classes
+
+
+def load_enemies(filename="data/enemies.txt"):
+
+    enemies = {}
+
+    for enemy_dict in iter_enemy_records(filename):
+        enemies[enemy_dict["enemy_id"]] = enemy_dict
+
+    return enemies
+
+
+def iter_class_records(filename="data/classes.txt"):
+    """
+    Yield one parsed and validated class dictionary at a time
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Class file not found: {filename}")
+
+    return _iter_class_entries(filename)
+
+
+def iter_enemy_records(filename="data/enemies.txt"):
+    """
+    Yield one parsed and validated enemy dictionary at a time
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Enemy file not found: {filename}")
+
+    return _iter_enemy_entries(filename)
+
+
+def _iter_class_entries(filename):
+    for line_no, lines in _iter_blocks(filename, "Class"):
+        class_dict = parse_class_block(lines)
+        validate_class_data(class_dict)
+        yield class_dict
+
+
+def _iter_enemy_entries(filename):
+    for line_no, lines in _iter_blocks(filename, "Enemy"):
+        enemy_dict = parse_enemy_block(lines)
+        validate_enemy_data(enemy_dict)
+        yield enemy_dict
+
+
+def get_class_templates(filename="data/classes.txt"):
+    """
+    Return the class definitions as a read-only catalog, loaded once
+    """
+    return _get_definitions("class", filename)[0]
+
+
+def get_enemy_templates(filename="data/enemies.txt"):
+    """
+    Return the enemy definitions as a read-only catalog, loaded once
+    """
+    return _get_definitions("enemy", filename)[0]
+
+
+def get_class_rows(filename="data/classes.txt"):
+    """
+    Return {class name: tuple in CLASS_FIELDS order} for fast character creation
+    """
+    return _get_definitions("class", filename)[1]
+
+
+def get_enemy_rows(filename="data/enemies.txt"):
+    """
+    Return {enemy id: tuple in ENEMY_FIELDS order} for fast enemy spawning
+    """
+    return _get_definitions("enemy", filename)[1]
+
+
+def reload_definitions():
+    """
+    Forget the loaded class and enemy definitions so the next lookup rereads the files
+    """
+    _definitions.clear()
+
+
+def _get_definitions(kind, filename):
+    cached = _definitions.get((kind, filename))
+    if cached is not None:
+        return cached
+
+    loader, defaults = {
+        "class": (load_classes, DEFAULT_CLASSES),
+        "enemy": (load_enemies, DEFAULT_ENEMIES)
+    }[kind]
+
+    try:
+        records = _load_cached(filename, loader, None)
+    except MissingDataFileError:
+        records = defaults
+
+    templates = freeze_catalog(records)
+    if kind == "class":
+        rows = {name: tuple(record[field] for field in CLASS_FIELDS)
+                for name, record in templates.items()}
+    else:
+        rows = {enemy_id: (record["name"], record["health"], record["health"], record["strength"],
+                           record["magic"], record["xp_reward"], record["gold_reward"])
+                for enemy_id, record in templates.items()}
+
+    _definitions[(kind, filename)] = (templates, rows)
+    return templates, rows
 
 
 # ============================================================================
@@ -135,6 +800,37 @@ def validate_item_data(item_dict):
     return True
 
 
+def validate_class_data(class_dict):
+
+    required_fields = ["class", "health", "strength", "magic"]
+
+    for field in required_fields:
+        if field not in class_dict:
+            raise InvalidDataFormatError(f"Missing class field: {field}")
+
+    if class_dict["health"] <= 0:
+        raise InvalidDataFormatError("Class health must be positive")
+
+    return True
+
+
+def validate_enemy_data(enemy_dict):
+
+    required_fields = [
+        "enemy_id", "name", "health", "strength",
+        "magic", "xp_reward", "gold_reward"
+    ]
+
+    for field in required_fields:
+        if field not in enemy_dict:
+            raise InvalidDataFormatError(f"Missing enemy field: {field}")
+
+    if enemy_dict["health"] <= 0:
+        raise InvalidDataFormatError("Enemy health must be positive")
+
+    return True
+
+
 # ============================================================================
 # DEFAULT DATA CREATION
 # ============================================================================
@@ -170,6 +866,22 @@ def create_default_data_files():
                 "DESCRIPTION: Restores 20 HP.\n"
             )
 
+    if not os.path.exists("data/classes.txt"):
+        with open("data/classes.txt", "w") as f:
+            f.write(format_definition_blocks(DEFAULT_CLASSES))
+
+    if not os.path.exists("data/enemies.txt"):
+        with open("data/enemies.txt", "w") as f:
+            f.write(format_definition_blocks(DEFAULT_ENEMIES))
+
+
+def format_definition_blocks(records):
+    # KEY: value blocks separated by blank lines, like the other data files
+    blocks = []
+    for record in records.values():
+        blocks.append("".join(f"{key.upper()}: {value}\n" for key, value in record.items()))
+    return "\n".join(blocks)
+
 
 # ============================================================================
 # PARSE BLOCKS
@@ -217,6 +929,38 @@ def parse_item_block(lines):
         item_info[key] = value
 
     return item_info
+
+
+def parse_class_block(lines):
+    return _parse_stat_block(lines, "class", ["health", "strength", "magic"])
+
+
+def parse_enemy_block(lines):
+    return _parse_stat_block(
+        lines, "enemy", ["health", "strength", "magic", "xp_reward", "gold_reward"]
+    )
+
+
+def _parse_stat_block(lines, label, int_fields):
+
+    info = {}
+
+    for line in lines:
+        if ": " not in line:
+            raise InvalidDataFormatError(f"Invalid {label} line format.")
+
+        key, value = line.split(": ", 1)
+        key = key.lower()
+
+        if key in int_fields:
+            try:
+                value = int(value)
+            except:
+                raise InvalidDataFormatError(f"Invalid integer for {key}")
+
+        info[key] = value
+
+    return info
 # ============================================================================
 # TESTING
 # ============================================================================
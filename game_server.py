@@ -0,0 +1,488 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Server Module
+
+Hosts many players in one process with asyncio. Every connection gets its
+own GameSession, while the quest and item catalogs are loaded once and
+shared (read-only) by all sessions. A character can only be in play in
+one session at a time, and is saved when its connection ends, with or
+without quit.
+
+Protocol: the client sends one command per line and every reply ends with
+a line that just says END. Send "help" for the command list.
+
+Run with:  python game_server.py --port 7777
+      or:  python game_server.py --unix /tmp/quest_chronicles.sock
+"""
+
+import re
+import asyncio
+import argparse
+import threading
+
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import game_data
+from custom_exceptions import (
+    GameError,
+    CharacterNotFoundError,
+    MissingDataFileError
+)
+
+END_OF_REPLY = "END"
+REVIVE_COST = 25
+
+# names become save file names, so keep them simple
+VALID_NAME = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+# held while checking for and writing a new save so two sessions can't
+# both create the same name
+_new_save_lock = threading.Lock()
+
+HELP_TEXT = """commands:
+  new <name> <Warrior|Mage|Rogue|Cleric>   create a character
+  load <name>                              load a saved character
+  stats                                    show character stats
+  inventory                                list inventory
+  use|equip_weapon|equip_armor|drop <item> use or manage an item
+  quests [active|available|completed]      list quests
+  accept|abandon|complete <quest_id>       manage quests
+  explore                                  fight a random enemy
+  revive                                   revive for 25 gold
+  shop                                     list items for sale
+  buy|sell <item>                          trade with the shop
+  save                                     save the character
+  quit                                     save and disconnect"""
+
+# ============================================================================
+# SHARED CATALOGS
+# ============================================================================
+
+def load_shared_catalogs(quest_file="data/quests.txt", item_file="data/items.txt"):
+    """
+    Load the quest and item catalogs once for every session in the process
+
+    Returns: Dictionary with 'quests', 'items' and a prebuilt 'quest_index'
+    """
+    try:
+        quests = game_data.load_quests_cached(quest_file)
+        items = game_data.load_items_cached(item_file)
+    except MissingDataFileError:
+        game_data.create_default_data_files()
+        quests = game_data.load_quests(quest_file)
+        items = game_data.load_items(item_file)
+
+    # frozen so sessions can share them safely (and across forked workers)
+    quests = game_data.freeze_catalog(quests)
+    items = game_data.freeze_catalog(items)
+
+    return {
+        "quests": quests,
+        "items": items,
+        "quest_index": quest_handler.QuestIndex(quests)
+    }
+
+# ============================================================================
+# PLAYERS IN PLAY
+# ============================================================================
+
+class ActivePlayers:
+    """
+    Names of the characters currently loaded by a server's sessions
+
+    Each session works on its own copy of its character, so two sessions
+    playing the same name would overwrite each other's saves. A name is
+    claimed by new/load and released when the session ends.
+    """
+
+    def __init__(self):
+        self.names = set()
+        self.lock = threading.Lock()
+
+    def claim(self, name):
+        with self.lock:
+            if name in self.names:
+                raise ValueError(f"{name} is already in play")
+            self.names.add(name)
+
+    def release(self, name):
+        with self.lock:
+            self.names.discard(name)
+
+
+# ============================================================================
+# SESSION
+# ============================================================================
+
+class GameSession:
+    """
+    One connected player
+
+    Wraps the same character_manager, inventory_system, quest_handler and
+    combat_system calls main.py uses, but returns text instead of printing
+    and keeps its character on the session instead of in module globals.
+    """
+
+    def __init__(self, catalogs, save_directory="data/save_games", players=None):
+        self.quests = catalogs["quests"]
+        self.items = catalogs["items"]
+        self.quest_index = catalogs["quest_index"]
+        self.save_directory = save_directory
+        self.players = players if players is not None else ActivePlayers()
+        self.character = None
+        self.availability = None
+
+        self.commands = {
+            "help": self.cmd_help,
+            "new": self.cmd_new,
+            "load": self.cmd_load,
+            "stats": self.cmd_stats,
+            "inventory": self.cmd_inventory,
+            "use": self.cmd_use,
+            "equip_weapon": self.cmd_equip_weapon,
+            "equip_armor": self.cmd_equip_armor,
+            "drop": self.cmd_drop,
+            "quests": self.cmd_quests,
+            "accept": self.cmd_accept,
+            "abandon": self.cmd_abandon,
+            "complete": self.cmd_complete,
+            "explore": self.cmd_explore,
+            "revive": self.cmd_revive,
+            "shop": self.cmd_shop,
+            "buy": self.cmd_buy,
+            "sell": self.cmd_sell,
+            "save": self.cmd_save
+        }
+
+    async def handle_line(self, line):
+        """
+        Run one command line
+
+        Returns: (reply text, keep_connection_open)
+        """
+        parts = line.split()
+        if not parts:
+            return "", True
+
+        command, args = parts[0].lower(), parts[1:]
+
+        if command == "quit":
+            await self.close()
+            return "goodbye", False
+
+        handler = self.commands.get(command)
+        if handler is None:
+            return f"ERROR: unknown command: {command} (try help)", True
+
+        try:
+            return await handler(args), True
+        except GameError as e:
+            return f"ERROR: {e}", True
+        except (ValueError, OSError) as e:
+            return f"ERROR: {e}", True
+
+    # ------------------------------------------------------------------
+    # helpers
+    # ------------------------------------------------------------------
+
+    async def close(self):
+        """
+        Save the character and give its name back (quit or a dropped connection)
+        """
+        character = self.character
+        if character is None:
+            return
+
+        self.character = None
+        self.availability = None
+        try:
+            await asyncio.to_thread(character_manager.save_character, character, self.save_directory)
+        finally:
+            self.players.release(character["name"])
+
+    def set_character(self, character):
+        # available quests are tracked per character and updated as quests
+        # change, so listing them doesn't rescan the quest log
+        if self.character is not None:
+            self.players.release(self.character["name"])
+        self.character = character
+        self.availability = quest_handler.QuestAvailability(self.quest_index, character)
+
+    def require_character(self):
+        if self.character is None:
+            raise CharacterNotFoundError("no character loaded (use new or load)")
+        return self.character
+
+    def require_arg(self, args, what):
+        if len(args) != 1:
+            raise ValueError(f"expected one {what}")
+        return args[0]
+
+    def lookup_item(self, item_id):
+        item = self.items.get(item_id)
+        if item is None:
+            raise ValueError(f"unknown item: {item_id}")
+        return item
+
+    def format_quests(self, quest_list):
+        if not quest_list:
+            return "no quests"
+        return "\n".join(
+            f"{q['quest_id']}: {q['title']} (Lvl {q['required_level']}) "
+            f"XP:{q['reward_xp']} Gold:{q['reward_gold']}"
+            for q in quest_list
+        )
+
+    # ------------------------------------------------------------------
+    # commands
+    # ------------------------------------------------------------------
+
+    async def cmd_help(self, args):
+        return HELP_TEXT
+
+    async def cmd_new(self, args):
+        if len(args) != 2:
+            raise ValueError("usage: new <name> <class>")
+
+        name, character_class = args
+        if not VALID_NAME.match(name):
+            raise ValueError("names may only use letters, numbers, _ and -")
+
+        character = character_manager.create_character(name, character_class)
+        self.players.claim(name)
+        try:
+            # file writes happen off the event loop
+            await asyncio.to_thread(self.save_new_character, character)
+        except BaseException:
+            self.players.release(name)
+            raise
+        self.set_character(character)
+        return f"created {name} the {character_class}"
+
+    def save_new_character(self, character):
+        with _new_save_lock:
+            if character["name"] in character_manager.list_saved_characters(self.save_directory):
+                raise ValueError(f"a character named {character['name']} already exists (use load)")
+            character_manager.save_character(character, self.save_directory)
+
+    async def cmd_load(self, args):
+        name = self.require_arg(args, "name")
+        if not VALID_NAME.match(name):
+            raise ValueError("names may only use letters, numbers, _ and -")
+
+        if self.character is not None and self.character["name"] == name:
+            raise ValueError(f"{name} is already loaded")
+
+        self.players.claim(name)
+        try:
+            character = await asyncio.to_thread(
+                character_manager.load_character, name, self.save_directory
+            )
+        except BaseException:
+            self.players.release(name)
+            raise
+        self.set_character(character)
+        return f"loaded {name}"
+
+    async def cmd_stats(self, args):
+        c = self.require_character()
+        return "\n".join([
+            f"Name: {c['name']}",
+            f"Class: {c['class']}",
+            f"Level: {c['level']}",
+            f"Health: {c['health']}/{c['max_health']}",
+            f"Strength: {c['strength']}",
+            f"Magic: {c['magic']}",
+            f"Gold: {c['gold']}",
+            f"XP: {c['experience']}",
+            f"Active Quests: {len(c['active_quests'])}",
+            f"Completed Quests: {len(c['completed_quests'])}"
+        ])
+
+    async def cmd_inventory(self, args):
+        inventory = inventory_system.get_inventory(self.require_character())
+        if len(inventory) == 0:
+            return "Inventory is empty."
+
+        lines = []
+        for item_id, count in inventory.quantities():
+            item = self.items.get(item_id)
+            if item is None:
+                lines.append(f"{item_id} x{count} (Unknown item)")
+            else:
+                lines.append(f"{item_id}: {item['name']} ({item['type']}) x{count}")
+        return "\n".join(lines)
+
+    async def cmd_use(self, args):
+        item_id = self.require_arg(args, "item_id")
+        return inventory_system.use_item(self.require_character(), item_id, self.lookup_item(item_id))
+
+    async def cmd_equip_weapon(self, args):
+        item_id = self.require_arg(args, "item_id")
+        return inventory_system.equip_weapon(self.require_character(), item_id, self.lookup_item(item_id))
+
+    async def cmd_equip_armor(self, args):
+        item_id = self.require_arg(args, "item_id")
+        return inventory_system.equip_armor(self.require_character(), item_id, self.lookup_item(item_id))
+
+    async def cmd_drop(self, args):
+        item_id = self.require_arg(args, "item_id")
+        inventory_system.remove_item_from_inventory(self.require_character(), item_id)
+        return f"dropped {item_id}"
+
+    async def cmd_quests(self, args):
+        character = self.require_character()
+        which = args[0].lower() if args else "available"
+
+        if which == "active":
+            return self.format_quests(quest_handler.get_active_quests(character, self.quests))
+        if which == "completed":
+            return self.format_quests(quest_handler.get_completed_quests(character, self.quests))
+        if which == "available":
+            return self.format_quests(self.availability.get_available())
+        raise ValueError("usage: quests [active|available|completed]")
+
+    async def cmd_accept(self, args):
+        quest_id = self.require_arg(args, "quest_id")
+        quest_handler.accept_quest(self.require_character(), quest_id, self.quests)
+        self.availability.quest_accepted(quest_id)
+        return f"accepted {quest_id}"
+
+    async def cmd_abandon(self, args):
+        quest_id = self.require_arg(args, "quest_id")
+        quest_handler.abandon_quest(self.require_character(), quest_id)
+        self.availability.quest_abandoned(quest_id)
+        return f"abandoned {quest_id}"
+
+    async def cmd_complete(self, args):
+        quest_id = self.require_arg(args, "quest_id")
+        rewards = quest_handler.complete_quest(self.require_character(), quest_id, self.quests)
+        self.availability.quest_completed(quest_id)
+        return f"completed {quest_id}: +{rewards['xp_gained']} XP, +{rewards['gold_gained']} gold"
+
+    async def cmd_explore(self, args):
+        character = self.require_character()
+        enemy = combat_system.get_random_enemy_for_level(character["level"])
+
+        # solved in one step and never printed, the server has no console
+        battle = combat_system.SimpleBattle(
+            character, enemy, auto_resolve=True, log_sink=combat_system.SILENT_LOG
+        )
+        result = battle.start_battle()
+
+        if result["winner"] != "player":
+            return f"the {enemy['name']} defeated you after {result['turns']} turns (use revive)"
+
+        character_manager.gain_experience(character, result["xp_gained"])
+        character_manager.add_gold(character, result["gold_gained"])
+        return (
+            f"you defeated the {enemy['name']} in {result['turns']} turns: "
+            f"+{result['xp_gained']} XP, +{result['gold_gained']} gold"
+        )
+
+    async def cmd_revive(self, args):
+        character = self.require_character()
+        if not character_manager.is_character_dead(character):
+            raise ValueError("character is not dead")
+
+        character_manager.add_gold(character, -REVIVE_COST)
+        character_manager.revive_character(character)
+        return f"revived with {character['health']} health"
+
+    async def cmd_shop(self, args):
+        lines = [f"{item_id}: {data['name']} - {data['cost']} gold" for item_id, data in self.items.items()]
+        return "\n".join(lines) if lines else "the shop is empty"
+
+    async def cmd_buy(self, args):
+        item_id = self.require_arg(args, "item_id")
+        inventory_system.purchase_item(self.require_character(), item_id, self.lookup_item(item_id))
+        return f"bought {item_id}"
+
+    async def cmd_sell(self, args):
+        item_id = self.require_arg(args, "item_id")
+        gold = inventory_system.sell_item(self.require_character(), item_id, self.lookup_item(item_id))
+        return f"sold {item_id} for {gold} gold"
+
+    async def cmd_save(self, args):
+        character = self.require_character()
+        await asyncio.to_thread(character_manager.save_character, character, self.save_directory)
+        return "game saved"
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class GameServer:
+    """
+    Accepts connections and gives each one its own GameSession
+    """
+
+    def __init__(self, catalogs=None, save_directory="data/save_games"):
+        if catalogs is None:
+            catalogs = load_shared_catalogs()
+        self.catalogs = catalogs
+        self.save_directory = save_directory
+        self.players = ActivePlayers()
+        self.session_count = 0
+
+    async def handle_client(self, reader, writer):
+        session = GameSession(self.catalogs, self.save_directory, self.players)
+        self.session_count += 1
+
+        try:
+            writer.write(f"welcome to Quest Chronicles\n{END_OF_REPLY}\n".encode())
+            await writer.drain()
+
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+
+                reply, keep_open = await session.handle_line(raw.decode("utf-8", "replace").strip())
+                writer.write(f"{reply}\n{END_OF_REPLY}\n".encode())
+                await writer.drain()
+
+                if not keep_open:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            try:
+                # a dropped connection still keeps the player's progress
+                await session.close()
+            finally:
+                self.session_count -= 1
+                writer.close()
+
+    async def start(self, host="127.0.0.1", port=7777, unix_path=None):
+        """
+        Start listening on TCP (host, port) or on a Unix socket path
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+async def serve(host="127.0.0.1", port=7777, unix_path=None):
+    server = await GameServer().start(host, port, unix_path)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quest Chronicles session server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", default=None, help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,115 @@ from custom_exceptions import (
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
+# ============================================================================
+# COUNTED INVENTORY
+# ============================================================================
+
+class Inventory:
+    """
+    Counted inventory: item_id -> quantity
+
+    Each item still takes one slot toward MAX_INVENTORY_SIZE, so len()
+    is the number of slots used. has/count/remove are O(1) instead of
+    list scans. Iterating gives one item_id per unit in the order items
+    were first added, which is the comma-joined list the save files use.
+    """
+
+    def __init__(self, items=()):
+        self._counts = {}
+        self._size = 0
+
+        for item_id in items:
+            self.add(item_id)
+
+    def add(self, item_id, quantity=1):
+        self._counts[item_id] = self._counts.get(item_id, 0) + quantity
+        self._size += quantity
+
+    def append(self, item_id):
+        self.add(item_id)
+
+    def remove(self, item_id, quantity=1):
+        current = self._counts.get(item_id, 0)
+        if current < quantity:
+            raise ValueError(f"not enough {item_id} in inventory")
+
+        if current == quantity:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = current - quantity
+        self._size -= quantity
+
+    def count(self, item_id):
+        return self._counts.get(item_id, 0)
+
+    def quantities(self):
+        """
+        Return (item_id, quantity) pairs in the order items were first added
+        """
+        return list(self._counts.items())
+
+    def to_list(self):
+        """
+        Return the flat list format used by save files
+        """
+        items = []
+        for item_id, quantity in self._counts.items():
+            items.extend([item_id] * quantity)
+        return items
+
+    @classmethod
+    def from_quantities(cls, pairs):
+        """
+        Build an inventory from (item_id, quantity) pairs
+        """
+        inventory = cls()
+        inventory._counts = dict(pairs)
+        inventory._size = sum(inventory._counts.values())
+        return inventory
+
+    def copy(self):
+        new_inventory = Inventory()
+        new_inventory._counts = dict(self._counts)
+        new_inventory._size = self._size
+        return new_inventory
+
+    def clear(self):
+        self._counts.clear()
+        self._size = 0
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for item_id, quantity in self._counts.items():
+            for _ in range(quantity):
+                yield item_id
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Inventory({self._counts!r})"
+
+
+def get_inventory(character):
+    """
+    Return character['inventory'] as an Inventory, upgrading a plain list in place
+    """
+    inventory = character["inventory"]
+    if not isinstance(inventory, Inventory):
+        inventory = Inventory(inventory)
+        character["inventory"] = inventory
+    return inventory
+
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
@@ -34,7 +143,7 @@ def add_item_to_inventory(character, item_id):
     Returns: True if added successfully
     Raises: InventoryFullError if inventory is at max capacity
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # check if the inventory is full
     if len(inventory) >= MAX_INVENTORY_SIZE:
@@ -58,7 +167,7 @@ def remove_item_from_inventory(character, item_id):
     """
     """Remove an item from the character's inventory."""
 
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # make sure the item is actually in the list
     if item_id not in inventory:
@@ -75,7 +184,7 @@ def has_item(character, item_id):
     
     Returns: True if item in inventory, False otherwise
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
     
     return item_id in inventory
 
@@ -86,7 +195,7 @@ def count_item(character, item_id):
     
     Returns: Integer count of item
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     return inventory.count(item_id)
 
@@ -96,7 +205,7 @@ def get_inventory_space_remaining(character):
     
     Returns: Integer representing available slots
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # calculate remaining space
     remaining = MAX_INVENTORY_SIZE - len(inventory)
@@ -109,9 +218,11 @@ def clear_inventory(character):
     
     Returns: List of removed items
     """
-    old_items = character["inventory"].copy()   # save what was there
+    inventory = get_inventory(character)
+
+    old_items = inventory.to_list()   # save what was there
     
-    character["inventory"].clear()              # empty the inventory
+    inventory.clear()                 # empty the inventory
     
     return old_items
 
@@ -137,7 +248,7 @@ def use_item(character, item_id, item_data):
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'consumable'
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     if item_id not in inventory:
         raise ItemNotFoundError(f"Item not found: {item_id}") # make sure they have the item
@@ -175,7 +286,7 @@ def equip_weapon(character, item_id, item_data):
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'weapon'
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # make sure item is in inventory
     if item_id not in inventory:
@@ -235,7 +346,7 @@ def equip_armor(character, item_id, item_data):
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'armor'
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # check item is actually in inventory because you cant add whats not there
     if item_id not in inventory:
@@ -281,7 +392,7 @@ def unequip_weapon(character):
     Returns: Item ID that was unequipped, or None if no weapon equipped
     Raises: InventoryFullError if inventory is full
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # check if a weapon is even equipped
     if "equipped_weapon" not in character or character["equipped_weapon"] is None:
@@ -315,7 +426,7 @@ def unequip_armor(character):
     Returns: Item ID that was unequipped, or None if no armor equipped
     Raises: InventoryFullError if inventory is full
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # check if armor is even equipped
     if "equipped_armor" not in character or character["equipped_armor"] is None:
@@ -360,7 +471,7 @@ def purchase_item(character, item_id, item_data):
         InventoryFullError if inventory is full
     """
     cost = item_data["cost"]
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # check gold
     if character["gold"] < cost:
@@ -391,7 +502,7 @@ def sell_item(character, item_id, item_data):
     Returns: Amount of gold received
     Raises: ItemNotFoundError if item not in inventory
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     # tem must be in inventory
     if item_id not in inventory:
@@ -462,23 +573,16 @@ def display_inventory(character, item_data_dict):
     
     Shows item names, types, and quantities
     """
-    inventory = character["inventory"]
+    inventory = get_inventory(character)
 
     if len(inventory) == 0:
         print("Inventory is empty.")
         return
 
-    # Count items (because duplicates may exist)
-    item_counts = {}
-    for item_id in inventory:
-        if item_id not in item_counts:
-            item_counts[item_id] = 0
-        item_counts[item_id] += 1
-
     print("=== INVENTORY ===")
 
-    # Display each item with name, type, and quantity
-    for item_id, count in item_counts.items():
+    # Display each item with name, type, and quantity (already counted)
+    for item_id, count in inventory.quantities():
 
         # look up item info from item_data_dict
         item_info = item_data_dict.get(item_id, None)
@@ -26,6 +26,8 @@ from custom_exceptions import *
 current_character = None
 all_quests = {}
 all_items = {}
+quest_index = None
+quest_availability = None
 game_running = False
 
 # ============================================================================
@@ -71,6 +73,7 @@ def new_game():
         print("Invalid class.")
         return
 
+    start_quest_tracking()
     game_loop()
 
 def load_game():
@@ -78,13 +81,15 @@ def load_game():
     load_game_data()
 
     print("\n=== LOAD GAME ===")
-    saved_chars = character_manager.list_saved_characters()
+    # summaries come from the save index, no save file is opened here
+    summaries = character_manager.list_save_summaries(sort_by="modified", reverse=True)
+    saved_chars = [summary["name"] for summary in summaries]
     if not saved_chars:
         print("No saved characters found.")
         return
 
-    for i, name in enumerate(saved_chars, 1):
-        print(f"{i}. {name}")
+    for i, summary in enumerate(summaries, 1):
+        print(f"{i}. {summary['name']} - Level {summary['level']} {summary['class']} ({summary['gold']} gold)")
 
     choice = input("Pick a character number: ").strip()
     while not choice.isdigit() or int(choice) < 1 or int(choice) > len(saved_chars):
@@ -98,8 +103,15 @@ def load_game():
         print("Error loading save.")
         return
 
+    start_quest_tracking()
     game_loop()
 
+def start_quest_tracking():
+    # available quests are kept up to date as quests change instead of
+    # being recomputed every time the quest menu opens
+    global quest_availability
+    quest_availability = quest_handler.QuestAvailability(quest_index, current_character)
+
 # ============================================================================ 
 # GAME LOOP
 # ============================================================================ 
@@ -204,7 +216,7 @@ def quest_menu():
         active = quest_handler.get_active_quests(current_character, all_quests)
         for q in active: quest_handler.display_quest_info(q)
     elif choice == "2":
-        available = quest_handler.get_available_quests(current_character, all_quests)
+        available = quest_availability.get_available()
         quest_handler.display_quest_list(available)
     elif choice == "3":
         completed = quest_handler.get_completed_quests(current_character, all_quests)
@@ -213,6 +225,7 @@ def quest_menu():
         qid = input("Enter quest_id: ").strip()
         try:
             quest_handler.accept_quest(current_character, qid, all_quests)
+            quest_availability.quest_accepted(qid)
             print("Quest accepted.")
         except Exception as e:
             print(f"Error: {e}")
@@ -220,6 +233,7 @@ def quest_menu():
         qid = input("Enter quest_id: ").strip()
         try:
             quest_handler.abandon_quest(current_character, qid)
+            quest_availability.quest_abandoned(qid)
             print("Quest abandoned.")
         except Exception as e:
             print(f"Error: {e}")
@@ -227,6 +241,7 @@ def quest_menu():
         qid = input("Enter quest_id: ").strip()
         try:
             rewards = quest_handler.complete_quest(current_character, qid, all_quests)
+            quest_availability.quest_completed(qid)
             print("Quest completed.")
             print(f"XP: {rewards['xp']}, Gold: {rewards['gold']}")
         except Exception as e:
@@ -294,10 +309,10 @@ def save_game():
         print("Error saving game.")
 
 def load_game_data():
-    global all_quests, all_items
+    global all_quests, all_items, quest_index
     try:
-        all_quests = game_data.load_quests("data/quests.txt")
-        all_items = game_data.load_items("data/items.txt")
+        all_quests = game_data.load_quests_cached("data/quests.txt")
+        all_items = game_data.load_items_cached("data/items.txt")
     except MissingDataFileError:
         game_data.create_default_data_files()
         all_quests = game_data.load_quests("data/quests.txt")
@@ -306,6 +321,13 @@ def load_game_data():
         all_quests = {}
         all_items = {}
 
+    # read-only from here on, nothing in the game should change catalog data
+    all_quests = game_data.freeze_catalog(all_quests)
+    all_items = game_data.freeze_catalog(all_items)
+
+    # built once so the quest menu doesn't rescan every quest
+    quest_index = quest_handler.QuestIndex(all_quests)
+
 # ============================================================================ 
 # CHARACTER DEATH
 # ============================================================================ 
@@ -9,6 +9,8 @@ AI Usage: ai was used to fix and debug code through out the making process.
 This module handles quest management, dependencies, and completion.
 """
 
+import bisect
+import heapq
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
@@ -16,7 +18,7 @@ from custom_exceptions import (
     QuestNotActiveError,
     InsufficientLevelError
 )
-from character_manager import gain_experience, add_gold
+from character_manager import gain_experience, add_gold, get_quest_log
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
@@ -47,6 +49,8 @@ def accept_quest(character, quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest not found: {quest_id}")
 
     quest = quest_data_dict[quest_id]
+    completed = get_quest_log(character, "completed_quests")
+    active = get_quest_log(character, "active_quests")
 
     # check level requirement
     if character["level"] < quest["required_level"]:
@@ -55,19 +59,19 @@ def accept_quest(character, quest_id, quest_data_dict):
     # check prerequisite
     prereq = quest["prerequisite"]   # can be "NONE" or another quest
     if prereq != "NONE":
-        if prereq not in character["completed_quests"]:
+        if prereq not in completed:
             raise QuestRequirementsNotMetError("Prerequisite quest not completed.")
 
     # cannot accept a completed quest
-    if quest_id in character["completed_quests"]:
+    if quest_id in completed:
         raise QuestAlreadyCompletedError("Quest already completed.")
 
     # cannot accept if quest already active
-    if quest_id in character["active_quests"]:
+    if quest_id in active:
         raise QuestRequirementsNotMetError("Quest already active.")
 
     # finally accept
-    character["active_quests"].append(quest_id)
+    active.append(quest_id)
 
     return True
     # TODO: Implement quest acceptance
@@ -100,17 +104,19 @@ def complete_quest(character, quest_id, quest_data_dict):
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError("Quest not found.")
 
+    active = get_quest_log(character, "active_quests")
+
     # quest must be active
-    if quest_id not in character["active_quests"]:
+    if quest_id not in active:
         raise QuestNotActiveError("Quest is not active.")
 
     quest = quest_data_dict[quest_id]
 
     # remove from active
-    character["active_quests"].remove(quest_id)
+    active.remove(quest_id)
 
     # add to completed
-    character["completed_quests"].append(quest_id)
+    get_quest_log(character, "completed_quests").append(quest_id)
 
     # give rewards
     xp = quest["reward_xp"]
@@ -139,10 +145,12 @@ def abandon_quest(character, quest_id):
     Returns: True if abandoned
     Raises: QuestNotActiveError if quest not active
     """
-    if quest_id not in character["active_quests"]:
+    active = get_quest_log(character, "active_quests")
+
+    if quest_id not in active:
         raise QuestNotActiveError("Quest is not active.")
 
-    character["active_quests"].remove(quest_id)
+    active.remove(quest_id)
 
     return True
     # TODO: Implement quest abandonment
@@ -182,24 +190,31 @@ def get_completed_quests(character, quest_data_dict):
     # TODO: Implement completed quest retrieval
     pass
 
-def get_available_quests(character, quest_data_dict):
+def get_available_quests(character, quest_data_dict, quest_index=None):
     """
     Get quests that character can currently accept
     
     Available = meets level req + prerequisite done + not completed + not active
     
+    Pass a QuestIndex built from quest_data_dict to skip the full catalog scan.
+    
     Returns: List of quest dictionaries
     """
+    if quest_index is not None:
+        return quest_index.get_available(character)
+
     available = []
+    completed = get_quest_log(character, "completed_quests")
+    active = get_quest_log(character, "active_quests")
 
     for quest_id, quest in quest_data_dict.items():
 
         # skip if already completed
-        if quest_id in character["completed_quests"]:
+        if quest_id in completed:
             continue
 
         # skip if already active
-        if quest_id in character["active_quests"]:
+        if quest_id in active:
             continue
 
         # check level
@@ -209,7 +224,7 @@ def get_available_quests(character, quest_data_dict):
         # check prerequisite
         prereq = quest["prerequisite"]
         if prereq != "NONE":
-            if prereq not in character["completed_quests"]:
+            if prereq not in completed:
                 continue
 
         # everything is okay
@@ -230,7 +245,7 @@ def is_quest_completed(character, quest_id):
     
     Returns: True if completed, False otherwise
     """
-    return quest_id in character["completed_quests"]
+    return quest_id in get_quest_log(character, "completed_quests")
     # TODO: Implement completion check
     pass
 
@@ -240,7 +255,7 @@ def is_quest_active(character, quest_id):
     
     Returns: True if active, False otherwise
     """
-    return quest_id in character["completed_quests"]
+    return quest_id in get_quest_log(character, "active_quests")
     # TODO: Implement active check
     pass
 
@@ -255,12 +270,13 @@ def can_accept_quest(character, quest_id, quest_data_dict):
         return False
 
     quest = quest_data_dict[quest_id]
+    completed = get_quest_log(character, "completed_quests")
 
     # already active or done?
-    if quest_id in character["active_quests"]:
+    if quest_id in get_quest_log(character, "active_quests"):
         return False
 
-    if quest_id in character["completed_quests"]:
+    if quest_id in completed:
         return False
 
     # level check
@@ -269,7 +285,7 @@ def can_accept_quest(character, quest_id, quest_data_dict):
 
     # prerequisite check
     prereq = quest["prerequisite"]
-    if prereq != "NONE" and prereq not in character["completed_quests"]:
+    if prereq != "NONE" and prereq not in completed:
         return False
 
     return True
@@ -277,7 +293,7 @@ def can_accept_quest(character, quest_id, quest_data_dict):
     # Check all requirements without raising exceptions
     pass
 
-def get_quest_prerequisite_chain(quest_id, quest_data_dict):
+def get_quest_prerequisite_chain(quest_id, quest_data_dict, quest_graph=None):
     """
     Get the full chain of prerequisites for a quest
     
@@ -285,19 +301,33 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
-    Raises: QuestNotFoundError if quest doesn't exist
+    Pass a QuestGraph built from quest_data_dict to reuse its memoized
+    chains instead of walking the prerequisite links again.
+    
+    Raises:
+        QuestNotFoundError if quest doesn't exist
+        QuestRequirementsNotMetError if the prerequisites form a cycle
     """
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError("Quest not found.")
 
+    if quest_graph is not None:
+        return quest_graph.get_chain(quest_id)
+
     chain = []
+    seen = set()
     current = quest_id
 
     while True:
         if current not in quest_data_dict:
             raise QuestNotFoundError("Quest not found in chain.")
 
-        chain.insert(0, current)
+        # a catalog like a -> b -> a would otherwise loop forever
+        if current in seen:
+            raise QuestRequirementsNotMetError(f"Prerequisite cycle at: {current}")
+        seen.add(current)
+
+        chain.append(current)
 
         prereq = quest_data_dict[current]["prerequisite"]
 
@@ -306,11 +336,9 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
 
         current = prereq
 
+    # collected from the quest backwards, so flip it once at the end
+    chain.reverse()
     return chain
-    # TODO: Implement prerequisite chain tracing
-    # Follow prerequisite links backwards
-    # Build list in reverse order
-    pass
 
 # ============================================================================
 # QUEST STATISTICS
@@ -428,6 +456,303 @@ def display_character_quest_progress(character, quest_data_dict):
     # TODO: Implement progress display
     pass
 
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Prerequisite graph computed once from quest_data_dict
+    
+    Stores each quest's parent (its prerequisite) and children, a
+    topological order (prerequisites always come first) and the depth of
+    every quest. Chains are built on demand by walking parent links, so
+    memory stays linear in the number of quests.
+    
+    Raises:
+        QuestNotFoundError if a prerequisite refers to a missing quest
+        QuestRequirementsNotMetError if the prerequisites form a cycle
+    """
+
+    def __init__(self, quest_data_dict):
+        self.parents = {}
+        self.children = {}
+        self.depth = {}
+        self.order = []
+
+        for quest_id, quest in quest_data_dict.items():
+            prereq = quest["prerequisite"]
+
+            if prereq == "NONE":
+                self.parents[quest_id] = None
+            elif prereq not in quest_data_dict:
+                raise QuestNotFoundError(f"Invalid prerequisite: {prereq}")
+            else:
+                self.parents[quest_id] = prereq
+
+            self.children.setdefault(quest_id, [])
+            if prereq != "NONE":
+                self.children.setdefault(prereq, []).append(quest_id)
+
+        # walk down from the root quests (breadth first)
+        pending = [quest_id for quest_id, parent in self.parents.items() if parent is None]
+        for quest_id in pending:
+            self.depth[quest_id] = 0
+
+        position = 0
+        while position < len(pending):
+            quest_id = pending[position]
+            position += 1
+            self.order.append(quest_id)
+
+            for child in self.children[quest_id]:
+                self.depth[child] = self.depth[quest_id] + 1
+                pending.append(child)
+
+        # anything never reached hangs off a cycle
+        if len(self.order) != len(self.parents):
+            for quest_id in self.parents:
+                if quest_id not in self.depth:
+                    raise QuestRequirementsNotMetError(
+                        "Prerequisite cycle: " + " -> ".join(self._find_cycle(quest_id))
+                    )
+
+    def _find_cycle(self, quest_id):
+        # follow parents until a quest repeats
+        path = []
+        index = {}
+        current = quest_id
+
+        while current not in index:
+            index[current] = len(path)
+            path.append(current)
+            current = self.parents[current]
+
+        cycle = path[index[current]:]
+        cycle.reverse()
+        return cycle + [cycle[0]]
+
+    def __contains__(self, quest_id):
+        return quest_id in self.parents
+
+    def get_chain(self, quest_id):
+        """
+        Return [earliest_prereq, ..., quest_id] in O(chain length)
+        
+        Raises: QuestNotFoundError if quest doesn't exist
+        """
+        if quest_id not in self.parents:
+            raise QuestNotFoundError("Quest not found.")
+
+        # depth says exactly how long the chain is, so fill it back to front
+        chain = [None] * (self.depth[quest_id] + 1)
+        position = len(chain) - 1
+        current = quest_id
+        while current is not None:
+            chain[position] = current
+            position -= 1
+            current = self.parents[current]
+
+        return chain
+
+    def get_depth(self, quest_id):
+        """
+        Return how many prerequisites come before a quest (roots are 0)
+        """
+        if quest_id not in self.depth:
+            raise QuestNotFoundError("Quest not found.")
+        return self.depth[quest_id]
+
+    def get_children(self, quest_id):
+        """
+        Return quests that list quest_id as their prerequisite
+        """
+        return list(self.children.get(quest_id, []))
+
+    def get_topological_order(self):
+        """
+        Return every quest ID with prerequisites before the quests needing them
+        """
+        return list(self.order)
+
+# ============================================================================
+# AVAILABLE QUEST INDEX
+# ============================================================================
+
+class QuestIndex:
+    """
+    Buckets quests by required_level and by prerequisite
+    
+    Root quests (prerequisite "NONE") are kept sorted by level, every other
+    quest is listed under the quest that unlocks it. Availability is then
+    "roots at or below the character's level plus quests unlocked by the
+    completed set" instead of a scan over the whole catalog.
+    """
+
+    def __init__(self, quest_data_dict):
+        self.quest_data_dict = quest_data_dict
+        self.position = {}
+        self.unlocks = {}
+        self.root_levels = []
+        self.root_ids = []
+
+        roots = []
+        for position, (quest_id, quest) in enumerate(quest_data_dict.items()):
+            self.position[quest_id] = position
+
+            prereq = quest["prerequisite"]
+            if prereq == "NONE":
+                roots.append((quest["required_level"], position, quest_id))
+            else:
+                self.unlocks.setdefault(prereq, []).append(quest_id)
+
+        roots.sort()
+        self.root_levels = [level for level, position, quest_id in roots]
+        self.root_ids = [quest_id for level, position, quest_id in roots]
+
+    def get_required_level(self, quest_id):
+        return self.quest_data_dict[quest_id]["required_level"]
+
+    def get_unlocked_quests(self, quest_id):
+        """
+        Return quests whose prerequisite is quest_id
+        """
+        return list(self.unlocks.get(quest_id, []))
+
+    def get_eligible_ids(self, character):
+        """
+        Return quest IDs whose prerequisite and level are satisfied
+        
+        Completed and active quests are not filtered out here.
+        """
+        level = character["level"]
+
+        # roots are sorted by level, so one bisect finds the cut-off
+        cut = bisect.bisect_right(self.root_levels, level)
+        eligible = self.root_ids[:cut]
+
+        for done_id in character["completed_quests"]:
+            for quest_id in self.unlocks.get(done_id, ()):
+                if self.get_required_level(quest_id) <= level:
+                    eligible.append(quest_id)
+
+        return eligible
+
+    def get_available(self, character):
+        """
+        Return available quest dictionaries in catalog order
+        """
+        completed = get_quest_log(character, "completed_quests")
+        active = get_quest_log(character, "active_quests")
+
+        available = []
+        for quest_id in dict.fromkeys(self.get_eligible_ids(character)):
+            if quest_id in completed or quest_id in active:
+                continue
+            available.append(quest_id)
+
+        available.sort(key=self.position.__getitem__)
+        return [self.quest_data_dict[quest_id] for quest_id in available]
+
+
+class QuestAvailability:
+    """
+    Incrementally maintained set of available quests for one character
+    
+    Built once from a QuestIndex, then kept current by calling
+    quest_accepted / quest_completed / quest_abandoned as they happen.
+    Level ups are picked up automatically the next time get_available runs.
+    """
+
+    def __init__(self, quest_index, character):
+        self.index = quest_index
+        self.character = character
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recompute the available set from scratch
+        """
+        self.level = self.character["level"]
+        self.available = set()
+        self.waiting = []    # heap of (required_level, position, quest_id)
+
+        completed = get_quest_log(self.character, "completed_quests")
+        active = get_quest_log(self.character, "active_quests")
+
+        for quest_id in self.index.root_ids:
+            self._offer(quest_id, completed, active)
+
+        for done_id in completed:
+            for quest_id in self.index.unlocks.get(done_id, ()):
+                self._offer(quest_id, completed, active)
+
+    def _offer(self, quest_id, completed, active):
+        # quest_id has its prerequisite met; place it by level
+        if quest_id in completed or quest_id in active:
+            return
+
+        required = self.index.get_required_level(quest_id)
+        if required <= self.level:
+            self.available.add(quest_id)
+        else:
+            heapq.heappush(self.waiting, (required, self.index.position[quest_id], quest_id))
+
+    def level_changed(self):
+        """
+        Move quests that the character's new level unlocks into the available set
+        """
+        new_level = self.character["level"]
+        if new_level == self.level:
+            return
+
+        if new_level < self.level:
+            # levels never go down in normal play, so just rebuild
+            self.rebuild()
+            return
+
+        self.level = new_level
+        completed = get_quest_log(self.character, "completed_quests")
+        active = get_quest_log(self.character, "active_quests")
+
+        while self.waiting and self.waiting[0][0] <= new_level:
+            required, position, quest_id = heapq.heappop(self.waiting)
+            if quest_id not in completed and quest_id not in active:
+                self.available.add(quest_id)
+
+    def quest_accepted(self, quest_id):
+        self.available.discard(quest_id)
+
+    def quest_abandoned(self, quest_id):
+        quest = self.index.quest_data_dict.get(quest_id)
+        if quest is None:
+            return
+
+        completed = get_quest_log(self.character, "completed_quests")
+        active = get_quest_log(self.character, "active_quests")
+
+        prereq = quest["prerequisite"]
+        if prereq == "NONE" or prereq in completed:
+            self._offer(quest_id, completed, active)
+
+    def quest_completed(self, quest_id):
+        self.available.discard(quest_id)
+        self.level_changed()   # quest rewards may have levelled the character
+
+        completed = get_quest_log(self.character, "completed_quests")
+        active = get_quest_log(self.character, "active_quests")
+        for unlocked_id in self.index.unlocks.get(quest_id, ()):
+            self._offer(unlocked_id, completed, active)
+
+    def get_available(self):
+        """
+        Return available quest dictionaries in catalog order
+        """
+        self.level_changed()
+
+        ordered = sorted(self.available, key=self.index.position.__getitem__)
+        return [self.index.quest_data_dict[quest_id] for quest_id in ordered]
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -437,22 +762,16 @@ def validate_quest_prerequisites(quest_data_dict):
     Validate that all quest prerequisites exist
     
     Checks that every prerequisite (that's not "NONE") refers to a real quest
+    and that no prerequisites loop back on themselves
     
     Returns: True if all valid
-    Raises: QuestNotFoundError if invalid prerequisite found
+    Raises:
+        QuestNotFoundError if invalid prerequisite found
+        QuestRequirementsNotMetError if the prerequisites form a cycle
     """
-    for quest_id, quest in quest_data_dict.items():
-        prereq = quest["prerequisite"]
-
-        if prereq != "NONE":
-            if prereq not in quest_data_dict:
-                raise QuestNotFoundError(f"Invalid prerequisite: {prereq}")
+    QuestGraph(quest_data_dict)
 
     return True
-    # TODO: Implement prerequisite validation
-    # Check each quest's prerequisite
-    # Ensure prerequisite exists in quest_data_dict
-    pass
 
 
 # ============================================================================
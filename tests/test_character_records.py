@@ -0,0 +1,93 @@
+"""
+Test Character Records
+Tests the slotted Character record and the experience table
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+
+# ============================================================================
+# CHARACTER RECORD TESTS
+# ============================================================================
+
+def test_character_record_mapping_access():
+    """Test that Character works through both keys and attributes"""
+    char = character_manager.create_character("SlotTest", "Rogue")
+
+    assert isinstance(char, character_manager.Character)
+    assert char['class'] == char.character_class == "Rogue"
+    assert 'equipped_weapon' not in char
+    assert len(char) == len(character_manager.CHARACTER_FIELDS)
+
+    char.health -= 10
+    assert char['health'] == char['max_health'] - 10
+
+    with pytest.raises(KeyError):
+        char['not_a_field'] = 1
+    with pytest.raises(AttributeError):
+        char.not_a_field = 1
+
+def test_character_record_with_equipment_and_saves(tmp_path):
+    """Test equipment keys and that loading gives a Character back"""
+    char = character_manager.create_character("SlotSaveTest", "Warrior")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.equip_weapon(char, "iron_sword", {'type': 'weapon', 'effect': 'strength:5'})
+    assert char['equipped_weapon'] == "iron_sword"
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("SlotSaveTest", str(tmp_path))
+    assert isinstance(loaded, character_manager.Character)
+    assert loaded['strength'] == char['strength']
+
+# ============================================================================
+# EXPERIENCE TABLE TESTS
+# ============================================================================
+
+def level_up_one_at_a_time(character, xp_amount):
+    # the original gain_experience loop, kept as the reference answer
+    character["experience"] += xp_amount
+    while character["experience"] >= character["level"] * 100:
+        character["experience"] -= character["level"] * 100
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+
+@pytest.mark.parametrize("level, experience, xp_amount", [
+    (1, 0, 0), (1, 0, 99), (1, 0, 100), (1, 50, 250), (3, 0, 299),
+    (3, 0, 300), (7, 650, 1), (1, 0, 10**6), (42, 4100, 123456789)
+])
+def test_gain_experience_matches_level_loop(level, experience, xp_amount):
+    """Test that the closed-form level solve gives the same stats as the loop"""
+    char = character_manager.create_character("XpTest", "Cleric")
+    char['level'] = level
+    char['experience'] = experience
+    char['health'] = 5
+    expected = char.copy()
+
+    plain = char.to_dict()
+    character_manager.gain_experience(char, xp_amount)
+    character_manager.gain_experience(plain, xp_amount)
+    level_up_one_at_a_time(expected, xp_amount)
+
+    assert char.to_dict() == expected.to_dict()
+    assert plain == expected.to_dict()
+
+def test_experience_for_levels_is_cumulative():
+    """Test the arithmetic series against summing level costs"""
+    for level in range(1, 20):
+        for levels in range(0, 30):
+            total = sum((level + i) * 100 for i in range(levels))
+            assert character_manager.experience_for_levels(level, levels) == total
+            assert character_manager.levels_for_experience(level, total) == levels
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
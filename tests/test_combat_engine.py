@@ -0,0 +1,170 @@
+"""
+Test Combat Engine
+Tests the headless simulator, batch resolution, outcome prediction and log sinks
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import combat_system
+
+def run_battle(character, enemy):
+    battle = combat_system.SimpleBattle(character, enemy)
+    battle_result = battle.start_battle()
+    return battle, battle_result
+
+# ============================================================================
+# HEADLESS SIMULATION TESTS
+# ============================================================================
+
+def test_simulation_matches_simple_battle(capsys):
+    """Test that simulated fights agree with SimpleBattle"""
+    for enemy_type in combat_system.ENEMY_TYPES:
+        stats = combat_system.simulate_battles("Warrior", 3, enemy_type, battles=20)
+
+        char = combat_system.create_simulation_character("Warrior", 3)
+        enemy = combat_system.create_enemy(enemy_type)
+        battle, result = run_battle(char, enemy)
+
+        assert stats['battles'] == 20
+        assert stats['win_rate'] == (1.0 if result['winner'] == 'player' else 0.0)
+        assert stats['mean_turns'] == battle.turn
+        assert stats['xp_per_fight'] == result['xp_gained']
+        assert stats['damage_taken'] == {char['max_health'] - char['health']: 20}
+
+def test_record_and_dict_characters_fight_the_same(capsys):
+    """Test that SimpleBattle gives the same fight for records and plain dicts"""
+    for enemy_type in combat_system.ENEMY_TYPES:
+        record = character_manager.create_character("Same", "Rogue")
+        plain = record.to_dict()
+
+        battle_a, result_a = run_battle(record, combat_system.create_enemy(enemy_type))
+        battle_b, result_b = run_battle(plain, combat_system.create_enemy(enemy_type))
+
+        assert result_a == result_b
+        assert battle_a.turn == battle_b.turn
+        assert record['health'] == plain['health']
+
+def test_balance_sweep_covers_every_combination():
+    """Test that the sweep runs all classes, levels and enemies"""
+    results = combat_system.run_balance_sweep(levels=[1, 2], battles=5)
+
+    assert len(results) == 4 * 2 * 3
+
+# ============================================================================
+# BATCH RESOLUTION TESTS
+# ============================================================================
+
+def make_matchups():
+    pairs = []
+    for character_class in combat_system.CHARACTER_CLASSES:
+        for level in [1, 4, 9]:
+            for enemy_type in combat_system.ENEMY_TYPES:
+                pairs.append((character_class, level, enemy_type))
+    return pairs
+
+def check_batch_matches_start_battle(capsys):
+    pairs = make_matchups()
+    chars = [combat_system.create_simulation_character(c, l) for c, l, e in pairs]
+    enemies = [combat_system.create_enemy(e) for c, l, e in pairs]
+
+    results = combat_system.resolve_battles(chars, enemies)
+
+    for (c, l, e), char, enemy, result in zip(pairs, chars, enemies, results):
+        expected_char = combat_system.create_simulation_character(c, l)
+        expected_enemy = combat_system.create_enemy(e)
+        battle, expected = run_battle(expected_char, expected_enemy)
+
+        assert result == expected
+        assert char['health'] == expected_char['health']
+        assert enemy['health'] == expected_enemy['health']
+
+def test_resolve_battles_matches_start_battle(capsys):
+    """Test batch resolution against SimpleBattle (numpy when installed)"""
+    check_batch_matches_start_battle(capsys)
+
+def test_resolve_battles_without_numpy(capsys, monkeypatch):
+    """Test the plain loop used when numpy is not installed"""
+    monkeypatch.setattr(combat_system, "np", None)
+    check_batch_matches_start_battle(capsys)
+
+def test_resolve_battles_rejects_dead_characters():
+    """Test that a dead character cannot be auto-resolved"""
+    char = character_manager.create_character("DeadTest", "Mage")
+    char['health'] = 0
+
+    with pytest.raises(CharacterDeadError):
+        combat_system.resolve_battles([char], [combat_system.create_enemy("goblin")])
+
+# ============================================================================
+# OUTCOME PREDICTION TESTS
+# ============================================================================
+
+def test_predict_battle_matches_start_battle(capsys):
+    """Test the closed-form predictor against the turn-by-turn battle"""
+    for c, l, e in make_matchups():
+        char = combat_system.create_simulation_character(c, l)
+        enemy = combat_system.create_enemy(e)
+        predicted = combat_system.predict_battle(char, enemy)
+
+        assert char['health'] == char['max_health']   # prediction changes nothing
+
+        battle, result = run_battle(char, enemy)
+        assert predicted == result
+        assert result['turns'] == battle.turn
+        assert result['character_health'] == char['health']
+
+def test_auto_resolve_battle(capsys):
+    """Test that auto_resolve gives the same outcome and final state"""
+    char = combat_system.create_simulation_character("Cleric", 8)
+    enemy = combat_system.create_enemy("dragon")
+    expected = combat_system.predict_battle(char, enemy)
+
+    battle = combat_system.SimpleBattle(char, enemy, auto_resolve=True)
+    result = battle.start_battle()
+
+    assert result == expected
+    assert battle.turn == expected['turns']
+    assert not battle.combat_active
+    assert enemy['health'] == expected['enemy_health']
+
+# ============================================================================
+# BATTLE LOG SINK TESTS
+# ============================================================================
+
+def test_silent_and_buffered_sinks(capsys):
+    """Test that the silent sink prints nothing and the buffered sink prints once"""
+    char = character_manager.create_character("SinkTest", "Warrior")
+    combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), log_sink=combat_system.SILENT_LOG).start_battle()
+    assert capsys.readouterr().out == ""
+
+    char = character_manager.create_character("SinkTest", "Warrior")
+    run_battle(char, combat_system.create_enemy("goblin"))
+    printed = capsys.readouterr().out
+
+    char = character_manager.create_character("SinkTest", "Warrior")
+    sink = combat_system.BufferedLogSink()
+    combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), log_sink=sink).start_battle()
+    assert capsys.readouterr().out == printed
+    assert sink.lines == []
+
+def test_structured_sink_records_events():
+    """Test that the structured sink records (turn, actor, damage, hp) tuples"""
+    char = character_manager.create_character("SinkTest", "Mage")
+    enemy = combat_system.create_enemy("orc")
+    sink = combat_system.StructuredLogSink()
+
+    battle = combat_system.SimpleBattle(char, enemy, log_sink=sink)
+    result = battle.start_battle()
+
+    assert sink.events[0] == (1, "player", 8 - 12 // 4, 80 - (8 - 12 // 4))
+    assert sink.events[-1][0] == result['turns']
+    assert sink.events[-1][3] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,230 @@
+"""
+Test Data Catalogs
+Tests the streaming, cached and multi-file catalog loaders in game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+QUEST_BLOCK = (
+    "QUEST_ID: {qid}\n"
+    "TITLE: Quest {qid}\n"
+    "DESCRIPTION: A test quest\n"
+    "REWARD_XP: 10\n"
+    "REWARD_GOLD: 5\n"
+    "REQUIRED_LEVEL: 1\n"
+    "PREREQUISITE: NONE\n"
+)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quest_records_streams_blocks(tmp_path):
+    """Test that quest records are yielded one block at a time"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_BLOCK.format(qid="a") + "\n\n\n" + QUEST_BLOCK.format(qid="b"))
+
+    records = game_data.iter_quest_records(str(path))
+    first = next(records)
+
+    assert first["quest_id"] == "a"
+    assert [r["quest_id"] for r in records] == ["b"]
+
+def test_streaming_loader_matches_load_items():
+    """Test that load_items is built on the streaming loader"""
+    items = game_data.load_items("data/items.txt")
+    streamed = list(game_data.iter_item_records("data/items.txt"))
+
+    assert list(items) == [item["item_id"] for item in streamed]
+
+def test_streaming_loader_empty_file(tmp_path):
+    """Test that an empty file is still rejected"""
+    path = tmp_path / "empty.txt"
+    path.write_text("\n\n")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quests(str(path))
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cached_loader_reuses_and_invalidates(tmp_path):
+    """Test that the compiled cache is written, reused and refreshed"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_BLOCK.format(qid="a"))
+
+    quests = game_data.load_quests_cached(str(path))
+    assert list(quests) == ["a"]
+    assert os.path.exists(game_data.get_cache_path(str(path)))
+
+    # cached copy is used while the file is unchanged
+    assert game_data.load_quests_cached(str(path)) == quests
+
+    path.write_text(QUEST_BLOCK.format(qid="a") + "\n" + QUEST_BLOCK.format(qid="b"))
+    assert list(game_data.load_quests_cached(str(path))) == ["a", "b"]
+
+def test_cached_loader_ignores_bad_cache(tmp_path):
+    """Test that a damaged cache falls back to the text parser"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_BLOCK.format(qid="a"))
+
+    cache_path = game_data.get_cache_path(str(path))
+    os.makedirs(os.path.dirname(cache_path))
+    with open(cache_path, "wb") as f:
+        f.write(b"not a cache")
+
+    assert list(game_data.load_quests_cached(str(path))) == ["a"]
+
+# ============================================================================
+# LAZY ITEM CATALOG TESTS
+# ============================================================================
+
+def test_item_catalog_decodes_on_first_access():
+    """Test that the mapped catalog only parses items that are looked up"""
+    items = game_data.load_items("data/items.txt")
+
+    with game_data.open_item_catalog("data/items.txt") as catalog:
+        assert len(catalog) == len(items)
+        assert catalog.decoded_count() == 0
+
+        assert catalog["iron_sword"] == items["iron_sword"]
+        assert catalog.decoded_count() == 1
+
+        assert "health_potion" in catalog
+        assert catalog.get("missing_item") is None
+        assert dict(catalog.items()) == items
+
+# ============================================================================
+# SHARDED CATALOG TESTS
+# ============================================================================
+
+def test_load_quest_catalog_merges_shards(tmp_path):
+    """Test that quest shards are parsed in parallel and merged"""
+    (tmp_path / "quests_1.txt").write_text(QUEST_BLOCK.format(qid="a"))
+    (tmp_path / "quests_2.txt").write_text(QUEST_BLOCK.format(qid="b"))
+
+    quests = game_data.load_quest_catalog(str(tmp_path / "quests_*.txt"), workers=2)
+
+    assert sorted(quests) == ["a", "b"]
+
+def test_load_quest_catalog_reports_duplicates(tmp_path):
+    """Test that a quest_id defined in two shards is reported with its origin"""
+    first = tmp_path / "quests_1.txt"
+    second = tmp_path / "quests_2.txt"
+    first.write_text(QUEST_BLOCK.format(qid="a"))
+    second.write_text(QUEST_BLOCK.format(qid="b") + "\n" + QUEST_BLOCK.format(qid="a"))
+
+    with pytest.raises(InvalidDataFormatError) as info:
+        game_data.load_quest_catalog([str(first), str(second)], workers=1)
+
+    assert f"{second} line 9" in str(info.value)
+
+# ============================================================================
+# FROZEN CATALOG TESTS
+# ============================================================================
+
+def test_frozen_catalog_is_read_only():
+    """Test that frozen catalogs read like dicts but cannot be changed"""
+    quests = game_data.load_quests("data/quests.txt")
+    frozen = game_data.freeze_catalog(quests)
+
+    assert frozen == quests
+    assert frozen['first_steps']['title'] == quests['first_steps']['title']
+
+    with pytest.raises(TypeError):
+        frozen['first_steps']['reward_xp'] = 1000
+    with pytest.raises(TypeError):
+        frozen['new_quest'] = {}
+
+def test_frozen_catalog_pickles_and_copies():
+    """Test that frozen catalogs survive pickle, copy and deepcopy"""
+    import copy
+    import pickle
+
+    frozen = game_data.freeze_catalog(game_data.load_quests("data/quests.txt"))
+
+    for clone in [pickle.loads(pickle.dumps(frozen)), copy.copy(frozen), copy.deepcopy(frozen)]:
+        assert isinstance(clone, game_data.FrozenCatalog)
+        assert clone == frozen
+        with pytest.raises(TypeError):
+            clone['first_steps']['reward_xp'] = 1000
+
+    record = copy.deepcopy(frozen['first_steps'])
+    assert isinstance(record, game_data.FrozenRecord)
+    assert record == frozen['first_steps']
+
+def test_game_runs_on_frozen_catalogs():
+    """Test that quest and inventory code never needs to mutate catalogs"""
+    import character_manager
+    import inventory_system
+    import quest_handler
+
+    quests = game_data.freeze_catalog(game_data.load_quests("data/quests.txt"))
+    items = game_data.freeze_catalog(game_data.load_items("data/items.txt"))
+    char = character_manager.create_character("FrozenTest", "Warrior")
+
+    quest_handler.accept_quest(char, 'first_steps', quests)
+    quest_handler.complete_quest(char, 'first_steps', quests)
+    char['level'] = 5
+    expected = quest_handler.get_available_quests(char, quests)
+    assert expected
+    assert quest_handler.get_available_quests(char, quests, quest_handler.QuestIndex(quests)) == expected
+
+    inventory_system.purchase_item(char, 'iron_sword', items['iron_sword'])
+    inventory_system.equip_weapon(char, 'iron_sword', items['iron_sword'])
+    assert char['equipped_weapon'] == 'iron_sword'
+
+# ============================================================================
+# CLASS AND ENEMY DEFINITION TESTS
+# ============================================================================
+
+def test_definitions_load_from_data_files(tmp_path):
+    """Test that designers can add enemies and classes in text files"""
+    enemies = dict(game_data.DEFAULT_ENEMIES)
+    enemies["slime"] = {"enemy_id": "slime", "name": "Slime", "health": 20, "strength": 3,
+                        "magic": 0, "xp_reward": 5, "gold_reward": 2}
+    path = tmp_path / "enemies.txt"
+    path.write_text(game_data.format_definition_blocks(enemies))
+
+    templates = game_data.get_enemy_templates(str(path))
+    assert templates["slime"]["name"] == "Slime"
+    assert game_data.get_enemy_rows(str(path))["slime"] == ("Slime", 20, 20, 3, 0, 5, 2)
+
+    with pytest.raises(TypeError):
+        templates["slime"]["health"] = 1
+
+def test_definitions_fall_back_to_defaults(tmp_path):
+    """Test that missing definition files use the built-in tables"""
+    rows = game_data.get_class_rows(str(tmp_path / "missing.txt"))
+
+    assert rows["Warrior"] == (120, 15, 5)
+    assert sorted(rows) == sorted(game_data.DEFAULT_CLASSES)
+
+def test_bad_definition_file_is_rejected(tmp_path):
+    """Test that a class without stats raises InvalidDataFormatError"""
+    path = tmp_path / "classes.txt"
+    path.write_text("CLASS: Bard\nHEALTH: 70\n")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_classes(str(path))
+
+def test_spawned_enemies_are_independent():
+    """Test that create_enemy hands out fresh copies of the template"""
+    import combat_system
+
+    first = combat_system.create_enemy("Goblin")
+    first['health'] = 0
+
+    assert combat_system.create_enemy("goblin")['health'] == 50
+    assert game_data.get_enemy_templates()["goblin"]["health"] == 50
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,179 @@
+"""
+Test Game Server
+Tests the asyncio session server and its per-connection sessions
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_server
+
+# ============================================================================
+# SESSION TESTS
+# ============================================================================
+
+def test_session_commands(tmp_path):
+    """Test a short game played through one session"""
+    catalogs = game_server.load_shared_catalogs()
+    session = game_server.GameSession(catalogs, str(tmp_path))
+
+    async def play():
+        replies = []
+        for line in ["stats", "new Hero Warrior", "accept first_steps", "explore",
+                     "complete first_steps", "buy health_potion", "inventory", "bogus"]:
+            reply, keep_open = await session.handle_line(line)
+            replies.append(reply)
+        return replies
+
+    replies = asyncio.run(play())
+
+    assert replies[0].startswith("ERROR")
+    assert replies[1] == "created Hero the Warrior"
+    assert replies[3].startswith("you defeated the Goblin")
+    assert replies[4].startswith("completed first_steps")
+    assert "health_potion" in replies[6]
+    assert replies[7].startswith("ERROR: unknown command")
+    assert os.path.exists(tmp_path / "Hero_save.txt")
+
+def test_new_does_not_overwrite_a_save(tmp_path):
+    """Test that new refuses a name that already has a save"""
+    catalogs = game_server.load_shared_catalogs()
+
+    async def play():
+        first = game_server.GameSession(catalogs, str(tmp_path))
+        await first.handle_line("new Hero Warrior")
+        await first.handle_line("buy health_potion")
+        await first.handle_line("save")
+
+        second = game_server.GameSession(catalogs, str(tmp_path))
+        reply, keep_open = await second.handle_line("new Hero Mage")
+        loaded, keep_open = await second.handle_line("load Hero")
+        return reply, loaded, second.character
+
+    reply, loaded, character = asyncio.run(play())
+
+    assert reply.startswith("ERROR") and "already exists" in reply
+    assert loaded == "loaded Hero"
+    assert character['class'] == "Warrior"
+    assert "health_potion" in character['inventory']
+
+def test_session_tracks_available_quests(tmp_path):
+    """Test that the session's available quests follow accept/abandon/complete"""
+    catalogs = game_server.load_shared_catalogs()
+    session = game_server.GameSession(catalogs, str(tmp_path))
+
+    def expected():
+        return session.format_quests(game_server.quest_handler.get_available_quests(
+            session.character, session.quests, session.quest_index
+        ))
+
+    async def play():
+        checks = []
+        for line in ["new Hero Warrior", "accept first_steps", "abandon first_steps",
+                     "accept first_steps", "explore", "complete first_steps"]:
+            await session.handle_line(line)
+            reply, keep_open = await session.handle_line("quests available")
+            checks.append(reply == expected())
+        return checks
+
+    assert all(asyncio.run(play()))
+
+def test_server_hosts_several_connections(tmp_path):
+    """Test that two TCP clients get separate sessions sharing the catalogs"""
+    server = game_server.GameServer(game_server.load_shared_catalogs(), str(tmp_path))
+
+    async def talk(port, name):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def read_reply():
+            lines = []
+            while True:
+                text = (await reader.readline()).decode().rstrip("\n")
+                if text == game_server.END_OF_REPLY:
+                    return "\n".join(lines)
+                lines.append(text)
+
+        async def command(line):
+            writer.write((line + "\n").encode())
+            await writer.drain()
+            return await read_reply()
+
+        await read_reply()   # welcome banner
+        created = await command(f"new {name} Mage")
+        stats = await command("stats")
+        await command("quit")
+        writer.close()
+        return created, stats
+
+    async def run():
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            return await asyncio.gather(talk(port, "Alpha"), talk(port, "Beta"))
+
+    (created_a, stats_a), (created_b, stats_b) = asyncio.run(run())
+
+    assert created_a == "created Alpha the Mage"
+    assert "Name: Alpha" in stats_a
+    assert "Name: Beta" in stats_b
+
+def test_server_plays_each_character_once_and_saves_on_disconnect(tmp_path):
+    """Test that a character can't be loaded twice and a dropped client keeps progress"""
+    server = game_server.GameServer(game_server.load_shared_catalogs(), str(tmp_path))
+
+    async def connect(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def read_reply():
+            lines = []
+            while True:
+                text = (await reader.readline()).decode().rstrip("\n")
+                if text == game_server.END_OF_REPLY:
+                    return "\n".join(lines)
+                lines.append(text)
+
+        async def command(line):
+            writer.write((line + "\n").encode())
+            await writer.drain()
+            return await read_reply()
+
+        await read_reply()   # welcome banner
+        return command, writer
+
+    async def run():
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            first, first_writer = await connect(port)
+            second, second_writer = await connect(port)
+
+            await first("new Hero Warrior")
+            await first("buy health_potion")
+            replies = [await second("load Hero"), await second("new Hero Mage")]
+
+            # drop the first connection without quit
+            first_writer.close()
+            for _ in range(100):
+                if "Hero" not in server.players.names:
+                    break
+                await asyncio.sleep(0.01)
+
+            replies.append(await second("load Hero"))
+            replies.append(await second("inventory"))
+            await second("quit")
+            second_writer.close()
+            return replies
+
+    refused_load, refused_new, loaded, inventory = asyncio.run(run())
+
+    assert refused_load == "ERROR: Hero is already in play"
+    assert refused_new == "ERROR: Hero is already in play"
+    assert loaded == "loaded Hero"
+    assert "health_potion" in inventory
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+"""
+Test Counted Inventory
+Tests the item_id -> quantity inventory used by inventory_system
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+
+# ============================================================================
+# COUNTED INVENTORY TESTS
+# ============================================================================
+
+def test_counted_inventory_operations():
+    """Test has/count/remove and slot accounting on the counted inventory"""
+    char = character_manager.create_character("CountTest", "Rogue")
+
+    for _ in range(3):
+        inventory_system.add_item_to_inventory(char, "health_potion")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+
+    assert inventory_system.count_item(char, "health_potion") == 3
+    assert inventory_system.has_item(char, "iron_sword")
+    assert inventory_system.get_inventory_space_remaining(char) == inventory_system.MAX_INVENTORY_SIZE - 4
+
+    inventory_system.remove_item_from_inventory(char, "health_potion")
+    assert inventory_system.count_item(char, "health_potion") == 2
+
+    assert inventory_system.clear_inventory(char) == ["health_potion", "health_potion", "iron_sword"]
+    assert len(char['inventory']) == 0
+
+def test_counted_inventory_save_round_trip(tmp_path):
+    """Test that the counted inventory saves in the old list format"""
+    char = character_manager.create_character("CountSaveTest", "Warrior")
+    for item_id in ["health_potion", "iron_sword", "health_potion"]:
+        inventory_system.add_item_to_inventory(char, item_id)
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("CountSaveTest", str(tmp_path))
+    assert inventory_system.count_item(loaded, "health_potion") == 2
+    assert loaded['inventory'] == char['inventory']
+
+def test_plain_list_inventory_is_upgraded():
+    """Test that inventory functions accept plain list inventories"""
+    char = {'inventory': ['item'] * inventory_system.MAX_INVENTORY_SIZE, 'gold': 100}
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "new_item")
+
+    assert isinstance(char['inventory'], inventory_system.Inventory)
+    assert inventory_system.count_item(char, "item") == inventory_system.MAX_INVENTORY_SIZE
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+"""
+Test Quest Indexing
+Tests the prerequisite graph, availability index and quest state containers
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import quest_handler
+import game_data
+
+def make_quest(quest_id, prerequisite="NONE", required_level=1):
+    return {
+        'quest_id': quest_id,
+        'title': quest_id.title(),
+        'description': 'A test',
+        'reward_xp': 10,
+        'reward_gold': 5,
+        'required_level': required_level,
+        'prerequisite': prerequisite
+    }
+
+# ============================================================================
+# QUEST GRAPH TESTS
+# ============================================================================
+
+def test_quest_graph_chain_and_order():
+    """Test chains, depth and topological order from the real catalog"""
+    quests = game_data.load_quests("data/quests.txt")
+    graph = quest_handler.QuestGraph(quests)
+
+    for quest_id in quests:
+        expected = quest_handler.get_quest_prerequisite_chain(quest_id, quests)
+        assert graph.get_chain(quest_id) == expected
+        assert graph.get_depth(quest_id) == len(expected) - 1
+
+    order = graph.get_topological_order()
+    for quest_id, quest in quests.items():
+        if quest['prerequisite'] != 'NONE':
+            assert order.index(quest['prerequisite']) < order.index(quest_id)
+
+def test_quest_graph_detects_cycles():
+    """Test that cyclic prerequisites are rejected instead of looping"""
+    quests = {
+        'a': make_quest('a', prerequisite='b'),
+        'b': make_quest('b', prerequisite='a')
+    }
+
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.QuestGraph(quests)
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.get_quest_prerequisite_chain('a', quests)
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.validate_quest_prerequisites(quests)
+
+# ============================================================================
+# AVAILABLE QUEST INDEX TESTS
+# ============================================================================
+
+def test_quest_index_matches_full_scan():
+    """Test that the indexed query returns the same quests as the scan"""
+    quests = game_data.load_quests("data/quests.txt")
+    index = quest_handler.QuestIndex(quests)
+    char = character_manager.create_character("IndexTest", "Warrior")
+
+    for level in range(1, 12):
+        char['level'] = level
+        expected = quest_handler.get_available_quests(char, quests)
+        assert quest_handler.get_available_quests(char, quests, index) == expected
+
+    char['completed_quests'].append('first_steps')
+    expected = quest_handler.get_available_quests(char, quests)
+    assert index.get_available(char) == expected
+
+def test_quest_availability_updates_incrementally():
+    """Test that completing quests and levelling up update availability"""
+    quests = {
+        'a': make_quest('a'),
+        'b': make_quest('b', prerequisite='a'),
+        'c': make_quest('c', prerequisite='a', required_level=3)
+    }
+    char = character_manager.create_character("TrackerTest", "Mage")
+    tracker = quest_handler.QuestAvailability(quest_handler.QuestIndex(quests), char)
+
+    assert [q['quest_id'] for q in tracker.get_available()] == ['a']
+
+    quest_handler.accept_quest(char, 'a', quests)
+    tracker.quest_accepted('a')
+    assert tracker.get_available() == []
+
+    quest_handler.complete_quest(char, 'a', quests)
+    tracker.quest_completed('a')
+    assert [q['quest_id'] for q in tracker.get_available()] == ['b']
+
+    char['level'] = 3
+    assert [q['quest_id'] for q in tracker.get_available()] == ['b', 'c']
+
+# ============================================================================
+# QUEST STATE TESTS
+# ============================================================================
+
+def test_quest_log_keeps_order_and_save_format(tmp_path):
+    """Test that quest logs stay ordered and round-trip through save files"""
+    char = character_manager.create_character("QuestLogTest", "Cleric")
+    for quest_id in ['c', 'a', 'b', 'a']:
+        char['completed_quests'].append(quest_id)
+
+    assert list(char['completed_quests']) == ['c', 'a', 'b']
+    assert 'a' in char['completed_quests']
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("QuestLogTest", str(tmp_path))
+    assert list(loaded['completed_quests']) == ['c', 'a', 'b']
+    assert isinstance(loaded['completed_quests'], character_manager.QuestLog)
+
+def test_quest_functions_upgrade_plain_lists():
+    """Test that quest_handler accepts characters built with plain lists"""
+    char = {'level': 5, 'active_quests': ['a'], 'completed_quests': []}
+
+    assert quest_handler.is_quest_active(char, 'a')
+    assert not quest_handler.is_quest_completed(char, 'a')
+    assert isinstance(char['active_quests'], character_manager.QuestLog)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,580 @@
+"""
+Test Save Storage
+Tests atomic saves, save backends and save file tooling in character_manager
+"""
+
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+# ============================================================================
+# ATOMIC / WRITE-BEHIND SAVE TESTS
+# ============================================================================
+
+def test_atomic_save_leaves_no_temp_files(tmp_path):
+    """Test that a save replaces the file in one step"""
+    char = character_manager.create_character("AtomicTest", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    char['gold'] = 500
+    character_manager.save_character(char, str(tmp_path))
+
+    assert [f for f in os.listdir(tmp_path) if not f.startswith(".save")] == ["AtomicTest_save.txt"]
+    assert character_manager.load_character("AtomicTest", str(tmp_path))['gold'] == 500
+
+def test_write_behind_saver_coalesces(tmp_path):
+    """Test that repeated saves inside the window become one write"""
+    char = character_manager.create_character("BehindTest", "Mage")
+
+    with character_manager.WriteBehindSaver(str(tmp_path), delay=0.2) as saver:
+        for gold in range(10):
+            char['gold'] = gold
+            saver.save(char)
+        assert not os.path.exists(tmp_path / "BehindTest_save.txt")
+
+        time.sleep(0.5)
+        assert saver.writes == 1
+        assert character_manager.load_character("BehindTest", str(tmp_path))['gold'] == 9
+
+        char['gold'] = 42
+        saver.save(char)
+
+    # close() flushes what is still pending
+    assert character_manager.load_character("BehindTest", str(tmp_path))['gold'] == 42
+
+def test_write_behind_never_writes_older_snapshot_last(tmp_path, monkeypatch):
+    """Test that a slow background write cannot land on top of a newer flush"""
+    import threading
+
+    char = character_manager.create_character("Order", "Warrior")
+    real_write_batch = character_manager.WriteBehindSaver._write_batch
+    started = threading.Event()
+
+    def slow_write_batch(self, batch):
+        # widen the gap between taking a batch and writing it
+        if not started.is_set():
+            started.set()
+            time.sleep(0.2)
+        real_write_batch(self, batch)
+
+    monkeypatch.setattr(character_manager.WriteBehindSaver, "_write_batch", slow_write_batch)
+
+    with character_manager.WriteBehindSaver(str(tmp_path), delay=0) as saver:
+        char['gold'] = 1
+        saver.save(char)
+        started.wait(1)
+        char['gold'] = 2
+        saver.save(char)
+        saver.flush()
+
+    assert character_manager.load_character("Order", str(tmp_path))['gold'] == 2
+
+# ============================================================================
+# SQLITE SAVE DATABASE TESTS
+# ============================================================================
+
+def test_database_backend_round_trip(tmp_path):
+    """Test that a .db path works with the normal save functions"""
+    db_path = str(tmp_path / "saves.db")
+    char = character_manager.create_character("DbTest", "Rogue")
+    char['inventory'].append("health_potion")
+    char['active_quests'].append("first_steps")
+
+    character_manager.save_character(char, db_path)
+    loaded = character_manager.load_character("DbTest", db_path)
+
+    assert loaded == char
+    assert character_manager.list_saved_characters(db_path) == ["DbTest"]
+
+    character_manager.delete_character("DbTest", db_path)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("DbTest", db_path)
+
+    char['gold'] = "lots"
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.save_character(char, db_path)
+
+    character_manager.close_save_databases()
+
+def test_database_batch_save_and_migration(tmp_path):
+    """Test batch saves and copying text saves into a database"""
+    text_dir = str(tmp_path / "saves")
+    db_path = str(tmp_path / "saves.sqlite")
+    chars = [character_manager.create_character(f"Hero{i}", "Cleric") for i in range(3)]
+
+    character_manager.save_characters(chars, text_dir)
+    with open(os.path.join(text_dir, "Broken_save.txt"), "w") as f:
+        f.write("NAME: Broken\n")
+
+    result = character_manager.migrate_saves_to_database(text_dir, db_path)
+
+    assert sorted(result["migrated"]) == ["Hero0", "Hero1", "Hero2"]
+    assert list(result["errors"]) == ["Broken"]
+    assert character_manager.list_saved_characters(db_path) == ["Hero0", "Hero1", "Hero2"]
+
+    character_manager.close_save_databases()
+
+def test_database_summaries_sort_by_save_time(tmp_path, monkeypatch):
+    """Test that database summaries carry the time each row was saved"""
+    import sqlite3
+
+    db_path = str(tmp_path / "saves.db")
+    # a database written before the modified column existed
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(character_manager._DATABASE_SCHEMA.replace(
+            ",\n    modified REAL NOT NULL DEFAULT 0", ""
+        ))
+    connection.close()
+
+    for stamp, name in [(300.0, "Late"), (100.0, "Early"), (200.0, "Middle")]:
+        monkeypatch.setattr(character_manager.time, "time", lambda: stamp)
+        character_manager.save_character(character_manager.create_character(name, "Mage"), db_path)
+
+    summaries = character_manager.list_save_summaries(db_path, sort_by="modified")
+    assert [s["name"] for s in summaries] == ["Early", "Middle", "Late"]
+    assert summaries[0]["modified"] == 100.0
+
+    character_manager.close_save_databases()
+
+# ============================================================================
+# BULK SAVE / LOAD TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("target", ["saves", "saves.db"])
+def test_bulk_save_and_load_report_per_name(tmp_path, target):
+    """Test that bulk calls return results and errors instead of raising"""
+    save_directory = str(tmp_path / target)
+    chars = [character_manager.create_character(f"Bulk{i}", "Warrior") for i in range(5)]
+    bad = character_manager.create_character("BadGold", "Mage")
+    bad['gold'] = "lots"
+
+    result = character_manager.save_characters(chars + [bad], save_directory, workers=3)
+
+    assert sorted(result["saved"]) == [f"Bulk{i}" for i in range(5)]
+    assert "InvalidSaveDataError" in result["errors"]["BadGold"]
+
+    names = [f"Bulk{i}" for i in range(5)] + ["Missing"]
+    result = character_manager.load_characters(names, save_directory, workers=3)
+
+    assert sorted(result["loaded"]) == [f"Bulk{i}" for i in range(5)]
+    assert result["loaded"]["Bulk3"] == chars[3]
+    assert "CharacterNotFoundError" in result["errors"]["Missing"]
+
+    character_manager.close_save_databases()
+
+# ============================================================================
+# BINARY SAVE FORMAT TESTS
+# ============================================================================
+
+def test_binary_save_round_trip(tmp_path):
+    """Test that a binary save directory writes .bin files that load back"""
+    character_manager.set_save_format(str(tmp_path), "binary")
+    char = character_manager.create_character("BinTest", "Mage")
+    for _ in range(3):
+        char['inventory'].append("health_potion")
+    char['inventory'].append("odd,item")
+    char['completed_quests'].append("first_steps")
+
+    character_manager.save_character(char, str(tmp_path))
+
+    assert os.path.exists(tmp_path / "BinTest_save.bin")
+    loaded = character_manager.load_character("BinTest", str(tmp_path))
+    assert loaded == char
+    assert loaded['inventory'].count("odd,item") == 1
+
+def test_binary_save_rejects_damage(tmp_path):
+    """Test that truncated binary saves raise SaveFileCorruptedError"""
+    char = character_manager.create_character("Cut", "Rogue")
+    data = character_manager.pack_character_save(char)
+    (tmp_path / "Cut_save.bin").write_bytes(data[:-3])
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Cut", str(tmp_path))
+
+def test_binary_version_1_saves_still_load(tmp_path):
+    """Test that saves in the first binary layout load after the format change"""
+    import struct
+
+    strings = [s.encode() for s in ["Old", "Mage", "health_potion", "first_steps"]]
+    data = b"".join([
+        struct.pack("<4sB", b"QCSV", 1),
+        struct.pack("<I", len(strings)),
+        struct.pack(f"<{len(strings)}H", *map(len, strings)),
+        *strings,
+        struct.pack("<II7qIII", 0, 1, 2, 80, 80, 8, 20, 150, 75, 1, 0, 1),
+        struct.pack("<3I", 2, 2, 3)
+    ])
+    (tmp_path / "Old_save.bin").write_bytes(data)
+
+    loaded = character_manager.load_character("Old", str(tmp_path))
+    assert loaded['level'] == 2 and loaded['gold'] == 75
+    assert loaded['inventory'].count("health_potion") == 2
+    assert list(loaded['completed_quests']) == ["first_steps"]
+
+def test_binary_save_rejects_nul_in_ids():
+    """Test that ids that would break the NUL-joined string block are refused"""
+    char = character_manager.create_character("Nul", "Rogue")
+    char['inventory'].append("bad\0item")
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.pack_character_save(char)
+
+def test_convert_saves_both_ways(tmp_path):
+    """Test converting a directory from text to binary and back"""
+    chars = [character_manager.create_character(f"Conv{i}", "Cleric") for i in range(3)]
+    character_manager.save_characters(chars, str(tmp_path))
+
+    result = character_manager.convert_saves(str(tmp_path), "binary")
+    assert sorted(result["converted"]) == ["Conv0", "Conv1", "Conv2"]
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith(".bin")) == [
+        "Conv0_save.bin", "Conv1_save.bin", "Conv2_save.bin"
+    ]
+    assert not any(f.endswith(".txt") for f in os.listdir(tmp_path))
+
+    character_manager.convert_saves(str(tmp_path), "text")
+    assert character_manager.load_character("Conv1", str(tmp_path)) == chars[1]
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == [
+        "Conv0", "Conv1", "Conv2"
+    ]
+
+# ============================================================================
+# SAVE JOURNAL TESTS
+# ============================================================================
+
+def test_autosave_appends_journal_and_replays(tmp_path):
+    """Test that autosaves append deltas that load_character replays"""
+    char = character_manager.create_character("JournalTest", "Warrior")
+    char['active_quests'].append("first_steps")
+    character_manager.save_character(char, str(tmp_path))
+    save_file = tmp_path / "JournalTest_save.txt"
+    snapshot = save_file.read_text()
+
+    character_manager.add_gold(char, 25)
+    char['inventory'].append("health_potion")
+    char['active_quests'].remove("first_steps")
+    char['completed_quests'].append("first_steps")
+    character_manager.autosave_character(char, str(tmp_path))
+
+    assert save_file.read_text() == snapshot
+    assert character_manager.read_journal("JournalTest", str(tmp_path)) == [
+        "gold=+25", "inventory_add=health_potion", "quest_completed=first_steps"
+    ]
+    assert character_manager.load_character("JournalTest", str(tmp_path)) == char
+
+    # a full save folds the journal back into the snapshot
+    character_manager.save_character(char, str(tmp_path))
+    assert not os.path.exists(tmp_path / "JournalTest_journal.txt")
+    assert character_manager.load_character("JournalTest", str(tmp_path)) == char
+
+def test_journal_compacts_and_skips_torn_record(tmp_path, monkeypatch):
+    """Test compaction past the limit and a half-written last record"""
+    monkeypatch.setattr(character_manager, "JOURNAL_LIMIT", 3)
+    char = character_manager.create_character("Compact", "Rogue")
+    character_manager.save_character(char, str(tmp_path))
+    journal = tmp_path / "Compact_journal.txt"
+
+    for _ in range(3):
+        char['gold'] += 1
+        character_manager.autosave_character(char, str(tmp_path))
+    assert len(journal.read_text().splitlines()) == 3
+
+    char['gold'] += 1
+    character_manager.autosave_character(char, str(tmp_path))
+    assert not journal.exists()
+    assert character_manager.load_character("Compact", str(tmp_path))['gold'] == 104
+
+    journal.write_text("gold=+5\ngold=+10")
+    char = character_manager.load_character("Compact", str(tmp_path))
+    assert char['gold'] == 109
+    assert journal.read_text() == "gold=+5\n"
+
+    # appending after the repair must not glue onto the torn record
+    char['experience'] += 10
+    character_manager.autosave_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Compact", str(tmp_path))
+    assert (loaded['gold'], loaded['experience']) == (109, 10)
+
+def test_loads_do_not_keep_journal_bases(tmp_path):
+    """Test that bulk loads and saves leave no per-character state behind"""
+    chars = [character_manager.create_character(f"Base{i}", "Mage") for i in range(5)]
+    character_manager.save_characters(chars, str(tmp_path))
+    character_manager.load_characters([c['name'] for c in chars], str(tmp_path))
+
+    directory = os.path.abspath(str(tmp_path))
+    assert not [key for key in character_manager._journal_bases if key[0] == directory]
+
+def test_write_behind_keeps_newer_journal_records(tmp_path):
+    """Test that a delayed snapshot only drops the records it covers"""
+    char = character_manager.create_character("Mixed", "Cleric")
+    character_manager.save_character(char, str(tmp_path))
+
+    with character_manager.WriteBehindSaver(str(tmp_path), delay=60) as saver:
+        char['gold'] = 150
+        character_manager.autosave_character(char, str(tmp_path))
+        saver.save(char)
+        char['gold'] = 175
+        character_manager.autosave_character(char, str(tmp_path))
+
+    assert character_manager.read_journal("Mixed", str(tmp_path)) == ["gold=+25"]
+    assert character_manager.load_character("Mixed", str(tmp_path))['gold'] == 175
+
+# ============================================================================
+# SAVE INDEX TESTS
+# ============================================================================
+
+def test_save_index_tracks_saves_and_deletes(tmp_path):
+    """Test that the index follows save/autosave/delete without opening saves"""
+    for i, cls in enumerate(["Warrior", "Mage", "Mage"]):
+        char = character_manager.create_character(f"Idx{i}", cls)
+        char['level'] = i + 1
+        character_manager.save_character(char, str(tmp_path))
+
+    char['gold'] = 999
+    character_manager.autosave_character(char, str(tmp_path))
+    character_manager.delete_character("Idx0", str(tmp_path))
+
+    assert not character_manager.is_save_index_stale(str(tmp_path))
+    index = character_manager.read_save_index(str(tmp_path))
+    assert sorted(index) == ["Idx1", "Idx2"]
+    assert index["Idx2"]["gold"] == 999
+
+    mages = character_manager.list_save_summaries(
+        str(tmp_path), sort_by="level", reverse=True, character_class="Mage"
+    )
+    assert [s["name"] for s in mages] == ["Idx2", "Idx1"]
+
+def test_save_index_compacts_on_append(tmp_path):
+    """Test that repeated saves keep the index file short without reading it"""
+    char = character_manager.create_character("Busy", "Warrior")
+    for gold in range(200):
+        char['gold'] = gold
+        character_manager.save_character(char, str(tmp_path))
+
+    with open(tmp_path / ".save_index") as f:
+        assert len(f.readlines()) <= 66
+    assert character_manager.read_save_index(str(tmp_path))["Busy"]["gold"] == 199
+
+def test_first_save_indexes_legacy_saves(tmp_path):
+    """Test that the first indexed save also lists saves made before the index"""
+    for name in ["Old", "Older"]:
+        legacy = character_manager.format_character_save(
+            character_manager.create_character(name, "Rogue")
+        )
+        (tmp_path / f"{name}_save.txt").write_text(legacy)
+
+    character_manager.save_character(character_manager.create_character("New", "Mage"), str(tmp_path))
+
+    names = [s["name"] for s in character_manager.list_save_summaries(str(tmp_path))]
+    assert names == ["New", "Old", "Older"]
+    assert not character_manager.is_save_index_stale(str(tmp_path))
+
+def test_save_index_refreshes_outside_changes(tmp_path):
+    """Test that saves copied in behind the index are picked up"""
+    char = character_manager.create_character("Known", "Rogue")
+    character_manager.save_character(char, str(tmp_path))
+
+    copied = character_manager.format_character_save(
+        character_manager.create_character("Copied", "Cleric")
+    )
+    (tmp_path / "Copied_save.txt").write_text(copied)
+
+    assert character_manager.is_save_index_stale(str(tmp_path))
+    names = [s["name"] for s in character_manager.list_save_summaries(str(tmp_path))]
+    assert names == ["Known"]
+    names = [s["name"] for s in character_manager.list_save_summaries(str(tmp_path), refresh=True)]
+    assert names == ["Copied", "Known"]
+    assert not character_manager.is_save_index_stale(str(tmp_path))
+
+    os.remove(tmp_path / ".save_index")
+    result = character_manager.rebuild_save_index(str(tmp_path))
+    assert sorted(result["indexed"]) == ["Copied", "Known"]
+
+# ============================================================================
+# CHECKSUM TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("save_format", ["text", "binary"])
+def test_checksum_mismatch_rejected_before_parsing(tmp_path, save_format):
+    """Test that a flipped byte fails the checksum instead of loading"""
+    character_manager.set_save_format(str(tmp_path), save_format)
+    char = character_manager.create_character("Crc", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+
+    path = character_manager.get_save_path("Crc", str(tmp_path))
+    data = bytearray(open(path, "rb").read())
+    assert character_manager.load_character("Crc", str(tmp_path)) == char
+
+    # GOLD: 100 -> GOLD: 900 still parses, only the checksum catches it
+    data[data.index(b"GOLD: 100") + 6 if save_format == "text" else 30] ^= 0x08
+    open(path, "wb").write(bytes(data))
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Crc", str(tmp_path))
+
+def test_text_saves_are_utf8_with_plain_newlines(tmp_path):
+    """Test that the checksummed bytes are exactly what lands on disk"""
+    char = character_manager.create_character("Zoë", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+
+    data = (tmp_path / "Zoë_save.txt").read_bytes()
+    assert b"\r\n" not in data
+    assert "NAME: Zoë\n".encode("utf-8") in data
+    assert character_manager.load_character("Zoë", str(tmp_path)) == char
+
+def test_verify_saves_reports_damage(tmp_path):
+    """Test the parallel scanner on good, legacy, damaged and empty saves"""
+    chars = [character_manager.create_character(f"Scan{i}", "Mage") for i in range(4)]
+    character_manager.save_characters(chars, str(tmp_path))
+
+    legacy = character_manager.format_character_save(character_manager.create_character("Old", "Rogue"))
+    (tmp_path / "Old_save.txt").write_text(legacy)
+    damaged = (tmp_path / "Scan1_save.txt").read_bytes()
+    (tmp_path / "Scan1_save.txt").write_bytes(damaged[:40] + damaged[41:])
+    (tmp_path / "Scan2_save.txt").write_bytes(b"")
+
+    result = character_manager.verify_saves(str(tmp_path), workers=4)
+
+    assert result["valid"] == ["Scan0", "Scan3"]
+    assert result["legacy"] == ["Old"]
+    assert sorted(result["corrupt"]) == ["Scan1", "Scan2"]
+
+@pytest.mark.parametrize("save_format", ["text", "binary"])
+def test_truncated_saves_are_corrupt_not_legacy(tmp_path, save_format):
+    """Test that a new save cut off before its trailer is reported as corrupt"""
+    character_manager.set_save_format(str(tmp_path), save_format)
+    char = character_manager.create_character("Cut", "Cleric")
+    for quest_id in ["first_steps", "goblin_menace", "dark_forest"]:
+        char['completed_quests'].append(quest_id)
+    character_manager.save_character(char, str(tmp_path))
+
+    path = character_manager.get_save_path("Cut", str(tmp_path))
+    data = open(path, "rb").read()
+    if save_format == "text":
+        # cut inside COMPLETED_QUESTS: the rest still parses on its own
+        cut = data[:data.index(b",goblin_menace")] + b"\n"
+    else:
+        cut = data[:-8]
+    open(path, "wb").write(cut)
+
+    result = character_manager.verify_saves(str(tmp_path))
+    assert list(result["corrupt"]) == ["Cut"]
+    assert "missing its checksum" in result["corrupt"]["Cut"]
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Cut", str(tmp_path))
+
+# ============================================================================
+# SAVE ARCHIVE TESTS
+# ============================================================================
+
+def test_archive_snapshots_and_random_access(tmp_path):
+    """Test packing a directory, appending snapshots and loading one name"""
+    save_dir = str(tmp_path / "saves")
+    archive = str(tmp_path / "backup.qca")
+    chars = [character_manager.create_character(f"Arc{i}", "Warrior") for i in range(20)]
+    character_manager.save_characters(chars, save_dir)
+
+    result = character_manager.archive_saves(save_dir, archive)
+    assert len(result["archived"]) == 20
+    assert character_manager.load_character("Arc7", archive) == chars[7]
+
+    # a newer snapshot of one character is appended, the rest stay put
+    chars[7]['gold'] = 1234
+    character_manager.save_character(chars[7], archive)
+    assert character_manager.load_character("Arc7", archive)['gold'] == 1234
+    assert character_manager.load_character("Arc8", archive) == chars[8]
+
+    character_manager.delete_character("Arc0", archive)
+    assert "Arc0" not in character_manager.list_saved_characters(archive)
+
+    summaries = character_manager.list_save_summaries(archive, sort_by="gold", reverse=True)
+    assert len(summaries) == 19
+    assert (summaries[0]["name"], summaries[0]["gold"]) == ("Arc7", 1234)
+    assert sorted(character_manager.rebuild_save_index(archive)["indexed"]) == sorted(
+        s["name"] for s in summaries
+    )
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Arc0", archive)
+
+def test_archive_survives_failed_append(tmp_path, monkeypatch):
+    """Test that an append failing midway leaves the old snapshots readable"""
+    archive = str(tmp_path / "safe.qca")
+    first = character_manager.create_character("Safe", "Cleric")
+    character_manager.save_character(first, archive)
+    size = os.path.getsize(archive)
+
+    def broken_index(entries):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(character_manager, "_pack_archive_entries", broken_index)
+    with pytest.raises(IOError):
+        character_manager.save_character(character_manager.create_character("Later", "Mage"), archive)
+    monkeypatch.undo()
+
+    assert os.path.getsize(archive) == size
+    assert character_manager.load_character("Safe", archive) == first
+
+def test_archive_save_raises_on_bad_character(tmp_path):
+    """Test that an invalid character is rejected instead of reported as saved"""
+    char = character_manager.create_character("Bad", "Rogue")
+    char['level'] = "ten"
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.save_character(char, str(tmp_path / "bad.qca"))
+
+def test_archive_rejects_damaged_footer(tmp_path):
+    """Test that a cut-off archive raises SaveFileCorruptedError"""
+    archive = tmp_path / "cut.qca"
+    char = character_manager.create_character("Cut", "Mage")
+    character_manager.save_character(char, str(archive))
+    archive.write_bytes(archive.read_bytes()[:-4])
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Cut", str(archive))
+
+def test_archive_single_saves_grow_linearly(tmp_path):
+    """Test that saving one character at a time doesn't rewrite the whole index"""
+    archive = str(tmp_path / "one_by_one.qca")
+    chars = [character_manager.create_character(f"Solo{i}", "Warrior") for i in range(300)]
+
+    sizes = []
+    for char in chars:
+        character_manager.save_character(char, archive)
+        sizes.append(os.path.getsize(archive))
+
+    # the last hundred saves cost about what the first hundred did
+    assert sizes[299] - sizes[199] < 2 * (sizes[99] - sizes[0])
+
+    # a fresh read walks the index chain back to the same names
+    character_manager._archive_indexes.clear()
+    assert sorted(character_manager.list_saved_characters(archive)) == sorted(c['name'] for c in chars)
+    assert character_manager.load_character("Solo123", archive) == chars[123]
+
+def test_version_1_archive_loads_and_appends(tmp_path):
+    """Test that archives with the single full-index footer still work"""
+    import struct
+    import zlib
+
+    old = character_manager.create_character("Old", "Rogue")
+    blob = zlib.compress(character_manager.encode_character_save(old, "binary"))
+    index = character_manager._pack_archive_entries({"Old": (5, len(blob), "Rogue", 1, 100, 1.0)})
+    archive = tmp_path / "v1.qca"
+    archive.write_bytes(b"".join([
+        struct.pack("<4sB", b"QCAR", 1), blob, index,
+        struct.pack("<QI4s", 5 + len(blob), len(index), b"QCAX")
+    ]))
+
+    new = character_manager.create_character("New", "Mage")
+    character_manager.save_character(new, str(archive))
+    character_manager._archive_indexes.clear()
+
+    assert sorted(character_manager.list_saved_characters(str(archive))) == ["New", "Old"]
+    assert character_manager.load_character("Old", str(archive)) == old
+    assert character_manager.load_character("New", str(archive)) == new
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])